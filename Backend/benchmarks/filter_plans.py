@@ -0,0 +1,112 @@
+"""
+Plan de ejecución de cada combinación de TaskFilter con y sin los índices de Task.
+
+    python -m benchmarks.filter_plans [--rows 200000] [--users 20]
+
+Para cada filtro muestra el plan (EXPLAIN ANALYZE en PostgreSQL, EXPLAIN QUERY
+PLAN en SQLite) y el mejor tiempo de 5 ejecuciones, primero sin los índices
+de Task.Meta.indexes y después con ellos. Las páginas de cursor se piden al 90 %
+de las tareas del usuario con TaskKeysetPagination, y el plan es el de su
+consulta de la primera fase (valores no nulos).
+"""
+import argparse
+from datetime import timedelta
+
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.request import Request
+
+from benchmarks.support import Task, seed_tasks, test_database, timed
+from tasks import search  # noqa: F401  (registra trigram_icontains)
+from tasks.operations import index_is_supported
+from tasks.pagination import TaskKeysetPagination
+
+PAGE_SIZE = 10
+
+
+def filter_combinations(user):
+    today = timezone.now().date()
+    base = Task.objects.filter(user=user)
+    category_id = Task.objects.filter(user=user, category__isnull=False).values_list('category_id', flat=True)[0]
+    return [
+        ('status', base.filter(status='pending')),
+        ('priority', base.filter(priority='high')),
+        ('category', base.filter(category_id=category_id)),
+        ('due_date', base.filter(due_date=today + timedelta(days=10))),
+        ('due_date range', base.filter(due_date__gte=today, due_date__lte=today + timedelta(days=30))),
+        ('status + due_date range', base.filter(status='in_progress', due_date__gte=today, due_date__lte=today + timedelta(days=30))),
+        ('priority + due_date range', base.filter(priority='low', due_date__gte=today, due_date__lte=today + timedelta(days=30))),
+        ('category + due_date range', base.filter(category_id=category_id, due_date__gte=today, due_date__lte=today + timedelta(days=30))),
+        ('title substring', base.filter(title__trigram_icontains='123 revis')),
+        ('description substring', base.filter(description__trigram_icontains='tarea 4567 con')),
+        ('open tasks by due_date', base.exclude(status='completed').order_by('due_date')),
+    ]
+
+
+def deep_cursor_pages(user, depth=0.9):
+    """(nombre, queryset, request) de una página de cursor a ``depth`` de las tareas del usuario."""
+    base = Task.objects.filter(user=user)
+    pages = []
+    for ordering in ('due_date', '-due_date', '-updated_at', 'created_at'):
+        paginator = TaskKeysetPagination()
+        paginator.ordering, paginator.cursor = ordering, None
+        field, _ = paginator.orderings[ordering.lstrip('-')]
+        rows = paginator.get_values_queryset(base).values_list(field, 'id')
+        value, pk = rows[int(rows.count() * depth)]
+        params = {'pagination': 'cursor', 'ordering': ordering, 'page_size': PAGE_SIZE,
+                  'cursor': paginator.encode_cursor(value, pk)}
+        request = Request(RequestFactory().get('/api/tasks/', params))
+        paginator.cursor = (value, pk)
+        pages.append((f'cursor page {depth:.0%} ({ordering}, id)', paginator.get_values_queryset(base), request))
+    return pages
+
+
+def explain(queryset, connection):
+    if connection.vendor == 'postgresql':
+        return queryset.explain(analyze=True, buffers=True)
+    return queryset.explain()
+
+
+def report(label, user, connection):
+    print(f'\n===== {label} =====')
+    for name, queryset in filter_combinations(user):
+        page = queryset[:PAGE_SIZE]
+        best = timed(lambda: list(page.all()))
+        print(f'\n--- {name}: {best:.2f} ms')
+        print(explain(page, connection))
+    base = Task.objects.filter(user=user)
+    for name, queryset, request in deep_cursor_pages(user):
+        best = timed(lambda: TaskKeysetPagination().paginate_queryset(base, request))
+        print(f'\n--- {name}: {best:.2f} ms')
+        print(explain(queryset[:PAGE_SIZE + 1], connection))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=20)
+    args = parser.parse_args()
+
+    with test_database() as connection:
+        user = seed_tasks(args.rows, users=args.users)
+        indexes = [index for index in Task._meta.indexes if index_is_supported(index, connection)]
+
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.remove_index(Task, index)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE tasks_task')
+        report('sin índices compuestos', user, connection)
+
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.add_index(Task, index)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE tasks_task')
+        report('con índices compuestos', user, connection)
+
+
+if __name__ == '__main__':
+    main()
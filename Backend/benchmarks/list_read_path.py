@@ -0,0 +1,44 @@
+"""
+Coste de serializar un listado de tareas: TaskSerializer sobre instancias de Task
+frente a TaskValuesSerializer sobre filas de values().
+
+    python -m benchmarks.list_read_path [--sizes 100 1000 10000]
+
+Ambas rutas incluyen las consultas (con la categoría en JOIN y las etiquetas en
+una segunda consulta) y la serialización hasta estructuras de Python listas
+para el renderer.
+"""
+import argparse
+
+from benchmarks.support import Task, seed_tasks, test_database, timed
+from tasks.serializers import TaskSerializer, TaskValuesSerializer
+
+
+def serializer_path(user, size):
+    tasks = Task.objects.filter(user=user).select_related('category').prefetch_related('tags').order_by('id')[:size]
+    return TaskSerializer(tasks, many=True).data
+
+
+def values_path(user, size):
+    serializer = TaskValuesSerializer()
+    rows = Task.objects.filter(user=user).order_by('id').values(*serializer.get_columns())[:size]
+    return serializer.serialize(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    with test_database():
+        user = seed_tasks(max(args.sizes))
+        print(f"{'filas':>8} {'TaskSerializer':>16} {'values()':>12} {'mejora':>8}")
+        for size in args.sizes:
+            assert len(values_path(user, size)) == len(serializer_path(user, size)) == size
+            slow = timed(lambda: serializer_path(user, size), repeat=3)
+            fast = timed(lambda: values_path(user, size), repeat=3)
+            print(f'{size:>8} {slow:>13.1f} ms {fast:>9.1f} ms {slow / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
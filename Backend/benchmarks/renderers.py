@@ -0,0 +1,52 @@
+"""
+Tiempo de render y tamaño de respuesta de páginas de tareas con el JSONRenderer
+de DRF, ORJSONRenderer y MessagePackRenderer.
+
+    python -m benchmarks.renderers [--sizes 10 100 1000]
+
+Las páginas son las que genera TaskViewSet.list (TaskValuesSerializer) dentro
+del mismo envoltorio count/next/previous/results de la paginación.
+"""
+import argparse
+
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.support import Task, seed_tasks, test_database, timed
+from tasks.renderers import MessagePackRenderer, ORJSONRenderer
+from tasks.serializers import TaskValuesSerializer
+
+RENDERERS = [
+    ('DRF JSONRenderer', JSONRenderer()),
+    ('ORJSONRenderer', ORJSONRenderer()),
+    ('MessagePackRenderer', MessagePackRenderer()),
+]
+
+
+def task_page(user, size):
+    serializer = TaskValuesSerializer()
+    rows = Task.objects.filter(user=user).order_by('id').values(*serializer.get_columns())[:size]
+    return {
+        'count': size,
+        'next': 'http://testserver/api/tasks/?page=2',
+        'previous': None,
+        'results': serializer.serialize(rows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    with test_database():
+        user = seed_tasks(max(args.sizes))
+        print(f"{'tareas':>7} {'renderer':<20} {'tiempo':>10} {'bytes':>10}")
+        for size in args.sizes:
+            page = task_page(user, size)
+            for name, renderer in RENDERERS:
+                best = timed(lambda: renderer.render(page), repeat=20)
+                print(f'{size:>7} {name:<20} {best:>7.3f} ms {len(renderer.render(page)):>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Utilidades comunes de los benchmarks.
+
+Los benchmarks se ejecutan desde Backend/ con ``python -m benchmarks.<nombre>``.
+Crean una base de datos de test (igual que ``manage.py test``) con los
+ajustes de DJANGO_SETTINGS_MODULE y la destruyen al terminar, así que nunca
+tocan los datos reales.
+"""
+import os
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskmaster_api.settings')
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from tasks.models import Category, Tag, Task  # noqa: E402
+
+User = get_user_model()
+
+
+@contextmanager
+def test_database():
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def seed_tasks(rows, username='bench', users=1, batch_size=5000):
+    """Crea ``rows`` tareas repartidas entre ``users`` usuarios y devuelve el primero."""
+    categories = [Category.objects.get_or_create(name=f'{username}-cat-{i}')[0] for i in range(5)]
+    tags = [Tag.objects.get_or_create(name=f'{username}-tag-{i}')[0] for i in range(8)]
+    owners = [
+        User.objects.create_user(username=f'{username}-{i}', email=f'{username}-{i}@example.com')
+        for i in range(users)
+    ]
+    statuses = ['pending', 'in_progress', 'completed']
+    priorities = ['low', 'medium', 'high']
+    today = timezone.now().date()
+    through = Task.tags.through
+    for start in range(0, rows, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, rows)):
+            # n recorre las tareas de cada usuario para que todos tengan la misma distribución
+            n = i // users
+            batch.append(Task(
+                user=owners[i % users],
+                title=f'Tarea {n} revisar informe',
+                description=f'Descripción de la tarea {n} con algo de texto de relleno. ' * 3,
+                due_date=today + timedelta(days=n % 365) if n % 7 else None,
+                priority=priorities[n % 3],
+                status=statuses[(n // 3) % 3],
+                category=categories[n % 5] if n % 4 else None,
+            ))
+        Task.objects.bulk_create(batch)
+        through.objects.bulk_create([
+            through(task_id=task.pk, tag_id=tags[(task.pk + j) % len(tags)].pk)
+            for task in batch
+            for j in range(task.pk % 3)
+        ])
+    return owners[0]
+
+
+def timed(func, repeat=5):
+    """Ejecuta ``func`` ``repeat`` veces y devuelve el mejor tiempo en milisegundos."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
@@ -0,0 +1,72 @@
+"""
+Coste por petición de un login rechazado por LoginRateThrottle frente a uno
+que llega a authenticate() con una contraseña incorrecta (hashing PBKDF2).
+
+    python -m benchmarks.throttling [--requests 200]
+
+Las peticiones se despachan directamente a LoginView con RequestFactory, sin
+middlewares; la columna "consultas" es el número de consultas por petición.
+"""
+import argparse
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+
+from benchmarks.support import User, test_database, timed
+from tasks.throttling import LoginRateThrottle
+from tasks.views import LoginView
+
+
+class UnlimitedLoginView(LoginView):
+    throttle_classes = ()
+
+
+def login_request(factory, username, password='incorrecta'):
+    body = json.dumps({'username': username, 'password': password})
+    return factory.post('/api/login/', body, content_type='application/json', REMOTE_ADDR='10.0.0.1')
+
+
+def exhaust(view, factory, username):
+    # Llena la ventana de la cuenta y de la IP hasta que el throttle rechaza
+    while view(login_request(factory, username)).status_code != 429:
+        pass
+
+
+def measure(label, func, requests):
+    best = timed(lambda: [func() for _ in range(requests)], repeat=3)
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    print(f'{label:<38} {best / requests * 1000:>10.1f} µs {len(queries):>10}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    with test_database():
+        User.objects.create_user(username='bench', password='correcta')
+        factory = RequestFactory()
+        view = LoginView.as_view()
+        unlimited = UnlimitedLoginView.as_view()
+        cache.clear()
+        exhaust(view, factory, 'bench')
+        # Request de DRF ya parseado, como lo recibe el throttle dentro de la vista
+        rejected = Request(login_request(factory, 'bench'), parsers=[JSONParser()])
+        throttle = LoginRateThrottle()
+
+        print(f"{'petición':<38} {'por petición':>13} {'consultas':>10}")
+        measure('LoginRateThrottle.allow_request', lambda: throttle.allow_request(rejected, None),
+                args.requests)
+        measure('login rechazado por el throttle', lambda: view(login_request(factory, 'bench')), args.requests)
+        measure('login sin throttle, contraseña mala', lambda: unlimited(login_request(factory, 'bench')),
+                max(args.requests // 20, 1))
+
+
+if __name__ == '__main__':
+    main()
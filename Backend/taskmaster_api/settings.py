@@ -47,8 +47,33 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'tasks.authentication.CachedJWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'tasks.renderers.ORJSONRenderer',
+        'tasks.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'tasks.renderers.ORJSONParser',
+        'tasks.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'TEST_REQUEST_RENDERER_CLASSES': [
+        'rest_framework.renderers.MultiPartRenderer',
+        'rest_framework.renderers.JSONRenderer',
+        'tasks.renderers.MessagePackRenderer',
+    ],
+    # Límites de tasks.throttling: '<scope>' por cuenta y '<scope>_ip' por IP
+    'DEFAULT_THROTTLE_RATES': {
+        'login': '10/min',
+        'login_ip': '30/min',
+        'forgot_password': '3/hour',
+        'forgot_password_ip': '20/hour',
+        'reset_password': '10/hour',
+        'reset_password_ip': '30/hour',
+    },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10  # Define el número de elementos por página
 }
@@ -89,6 +114,9 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000", 
 ]
 
+# Cabeceras que el frontend necesita leer para GET condicionales e If-Match
+CORS_EXPOSE_HEADERS = ['ETag', 'Last-Modified', 'Task-Version']
+
 ROOT_URLCONF = 'taskmaster_api.urls'
 
 TEMPLATES = [
@@ -185,6 +213,50 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 FRONTEND_URL = 'http://localhost:3000'
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# En producción con varios workers conviene un backend compartido (Redis, Memcached...).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Caché de respuestas de /api/tasks/ (tasks.cache.TaskListCache)
+TASK_LIST_CACHE_ALIAS = 'default'
+TASK_LIST_CACHE_TIMEOUT = 300
+
+# Respuestas guardadas para la cabecera Idempotency-Key (tasks.idempotency)
+IDEMPOTENCY_CACHE_ALIAS = 'default'
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+# Caché en memoria de usuarios autenticados por JWT (tasks.authentication)
+AUTH_USER_CACHE_TTL = 30
+AUTH_USER_CACHE_SIZE = 10000
+
+# POST /api/batch/ (tasks.batch): sub-peticiones por batch e hilos para las lecturas
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# Caché con los contadores de tasks.throttling (compartida entre procesos en producción)
+THROTTLE_CACHE_ALIAS = 'default'
+
+# Lista negra de refresh tokens (tasks.blacklist): tamaño y tasa de falsos
+# positivos del filtro de Bloom, y cada cuántos segundos se sincroniza con la
+# base de datos y se borran las entradas caducadas
+BLACKLIST_FILTER_CAPACITY = 100000
+BLACKLIST_FILTER_ERROR_RATE = 0.001
+BLACKLIST_SYNC_INTERVAL = 1
+BLACKLIST_PRUNE_INTERVAL = 3600
+
+# Vistas asíncronas de login y contraseñas (activar al servir con ASGI) y pool
+# de hilos para el hashing: hilos y trabajos en curso o en cola antes de responder 503
+ASYNC_AUTH_VIEWS = False
+PASSWORD_HASH_WORKERS = 2
+PASSWORD_HASH_MAX_PENDING = 32
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,70 @@
+"""
+Borrado de cuentas en segundo plano.
+
+Borrar un User con delete() hace que el Collector de Django cargue todas sus
+tareas y enlaces con etiquetas en memoria dentro de una sola transacción. Aquí
+la petición solo desactiva al usuario y crea un AccountDeletion; el worker
+borra después las tareas por bloques (tasks.bulk.delete_task_chunk) y, cuando
+no queda ninguna, el perfil y el propio usuario, que ya es un borrado pequeño.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .authentication import user_cache
+from .bulk import delete_task_chunk
+from .models import AccountDeletion, Task, UserProfile
+
+DELETION_CHUNK_SIZE = 1000
+
+
+def request_account_deletion(user):
+    """Desactiva ``user`` y encola el borrado de su cuenta; devuelve el AccountDeletion."""
+    with transaction.atomic():
+        get_user_model().objects.filter(pk=user.pk).update(is_active=False)
+        deletion, _ = AccountDeletion.objects.get_or_create(
+            user_id=user.pk,
+            defaults={
+                'username': user.get_username(),
+                'total_tasks': Task.objects.filter(user_id=user.pk).count(),
+            },
+        )
+    # update() no emite post_save: sin esto el usuario seguiría activo en la caché
+    user_cache.invalidate(user.pk)
+    return deletion
+
+
+def pending_deletions():
+    return AccountDeletion.objects.exclude(status=AccountDeletion.STATUS_DONE).order_by('requested_at')
+
+
+def process_account_deletion(deletion_id, chunk_size=DELETION_CHUNK_SIZE, on_progress=None):
+    """
+    Avanza el borrado ``deletion_id`` hasta terminarlo. Cada bloque es una
+    transacción que bloquea la fila de AccountDeletion (SKIP LOCKED: si otro
+    worker la tiene, este la deja), borra hasta ``chunk_size`` tareas y guarda
+    el avance. Devuelve el AccountDeletion, o None si otro worker lo tiene.
+    """
+    while True:
+        with transaction.atomic():
+            deletion = (
+                AccountDeletion.objects.select_for_update(skip_locked=True)
+                .filter(pk=deletion_id).exclude(status=AccountDeletion.STATUS_DONE).first()
+            )
+            if deletion is None:
+                return AccountDeletion.objects.filter(pk=deletion_id, status=AccountDeletion.STATUS_DONE).first()
+            deleted = delete_task_chunk(Task.objects.filter(user_id=deletion.user_id), chunk_size)
+            if deleted:
+                deletion.deleted_tasks += deleted
+                deletion.status = AccountDeletion.STATUS_RUNNING
+            else:
+                # Sin tareas, el Collector ya no tiene nada grande que cargar
+                UserProfile.objects.filter(user_id=deletion.user_id).delete()
+                get_user_model().objects.filter(pk=deletion.user_id).delete()
+                deletion.status = AccountDeletion.STATUS_DONE
+                deletion.finished_at = timezone.now()
+            deletion.save()
+        if on_progress is not None:
+            on_progress(deletion)
+        if deletion.status == AccountDeletion.STATUS_DONE:
+            return deletion
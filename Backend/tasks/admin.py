@@ -1,6 +1,56 @@
+from django import forms
 from django.contrib import admin
-from .models import Task, Category, UserProfile
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.forms import UserChangeForm
+from .accounts import request_account_deletion
+from .models import Task, Category, UserProfile, AccountDeletion
+from .serializers import DUPLICATE_EMAIL_MESSAGE
+
+User = get_user_model()
 
 admin.site.register(Task)
 admin.site.register(Category)
-admin.site.register(UserProfile)
\ No newline at end of file
+admin.site.register(UserProfile)
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = ('username', 'user_id', 'status', 'deleted_tasks', 'total_tasks', 'progress', 'requested_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = list_display
+
+    def has_add_permission(self, request):
+        return False
+
+class UniqueEmailUserChangeForm(UserChangeForm):
+    def clean_email(self):
+        # Mismo criterio que el índice auth_user_email_ci_uniq (migración 0016)
+        email = self.cleaned_data.get('email')
+        if email and User.objects.filter(email__iexact=email).exclude(pk=self.instance.pk).exists():
+            raise forms.ValidationError(DUPLICATE_EMAIL_MESSAGE)
+        return email
+
+# Importar UserAdmin ya ha registrado el admin de auth: se sustituye por uno con esta validación
+admin.site.unregister(User)
+
+@admin.register(User)
+class TasksUserAdmin(UserAdmin):
+    form = UniqueEmailUserChangeForm
+
+    # Borrar desde el admin encola el borrado (tasks.accounts) en lugar de ejecutar
+    # la cascada del Collector con todas las tareas del usuario en esta petición
+    def delete_model(self, request, obj):
+        request_account_deletion(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            request_account_deletion(user)
+
+    def get_deleted_objects(self, objs, request):
+        # La confirmación tampoco recorre las relaciones: el worker borra las tareas por bloques
+        objs = list(objs)
+        summary = [
+            f'{user}: se desactiva y sus {Task.objects.filter(user_id=user.pk).count()} tareas se borran en segundo plano'
+            for user in objs
+        ]
+        return summary, {User._meta.verbose_name_plural: len(objs)}, set(), []
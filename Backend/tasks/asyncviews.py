@@ -0,0 +1,37 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+
+
+class AsyncAPIViewMixin:
+    """
+    dispatch() asíncrono para vistas de DRF, que no las soporta (3.16).
+
+    initial() (autenticación, permisos y throttles, que pueden consultar la base
+    de datos) se ejecuta con sync_to_async; los handlers pueden ser corrutinas o
+    métodos normales. El resto del ciclo (excepciones, negociación de contenido)
+    es el de APIView.
+    """
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,111 @@
+"""
+Autenticación JWT sin consulta a la base de datos por petición.
+
+- CachedJWTAuthentication, la clase por defecto, devuelve el User completo pero
+  lo guarda en una caché en memoria del proceso durante AUTH_USER_CACHE_TTL
+  segundos. Las señales de tasks.signals la invalidan cuando el usuario se
+  guarda o se borra; en los demás procesos la entrada dura como mucho el TTL.
+- SafeMethodsStatelessJWTAuthentication, la de las vistas de tareas, categorías
+  y etiquetas: en lecturas (GET/HEAD/OPTIONS) construye un TokenUser a partir de
+  los claims del token, porque solo hace falta el id del usuario; en escrituras
+  se comporta como CachedJWTAuthentication, que rechaza a los usuarios
+  desactivados (cuenta en borrado) o ya borrados.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """Caché LRU con TTL de usuarios por id, local al proceso y segura entre hilos."""
+
+    def __init__(self, ttl=None, max_size=None):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else settings.AUTH_USER_CACHE_TTL
+
+    @property
+    def max_size(self):
+        return self._max_size if self._max_size is not None else settings.AUTH_USER_CACHE_SIZE
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # Cada petición recibe su copia: las vistas pueden modificar request.user
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, copy.copy(user))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication que resuelve el usuario desde user_cache antes de ir a la base de datos."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        user = user_cache.get(user_id)
+        if user is None:
+            # Primera vez (o entrada caducada): comprobaciones completas de simplejwt
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+            return user
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
+
+
+class SafeMethodsStatelessJWTAuthentication(CachedJWTAuthentication):
+    """Usuario a partir de los claims en lecturas; User completo (y activo) en escrituras."""
+
+    def authenticate(self, request):
+        # DRF crea una instancia por petición: guardar el método aquí es seguro
+        self.stateless = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if self.stateless:
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+        return super().get_user(validated_token)
@@ -0,0 +1,164 @@
+"""
+Ejecución de las sub-peticiones de POST /api/batch/ (ver views.BatchView).
+
+Cada sub-petición se despacha directamente a la vista que resuelve su ruta, sin
+pasar otra vez por los middlewares, y con el usuario ya autenticado por la
+petición batch (``_force_auth_user``, el mismo mecanismo que usa
+APIClient.force_authenticate), de modo que el JWT se valida una sola vez.
+Las lecturas (GET/HEAD) consecutivas se ejecutan en paralelo; las escrituras,
+en orden y de una en una. Cada sub-petición es independiente: no comparten
+transacción.
+
+Solo se despachan vistas síncronas de DRF (APIView) bajo /api/: el admin y las
+demás vistas de Django dependen de los middlewares de sesión y CSRF que aquí no
+se ejecutan.
+"""
+import io
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import serializers
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = ('GET', 'HEAD')
+API_PREFIX = '/api/'
+# Cabeceras de la respuesta de cada sub-petición que se devuelven en el batch
+RETURNED_HEADERS = ('ETag', 'Last-Modified', 'Location', 'Task-Version', 'X-Cache')
+# Cabeceras de la petición batch que no se heredan: son propias de cada sub-petición
+SUBREQUEST_OWN_HEADERS = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_MATCH', 'HTTP_IDEMPOTENCY_KEY')
+
+
+class SubRequestSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False)
+    method = serializers.ChoiceField(choices=['GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE'], default='GET')
+    path = serializers.RegexField(r'^/', max_length=2000)
+    headers = serializers.DictField(child=serializers.CharField(), required=False)
+    body = serializers.JSONField(required=False)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(f'Como máximo {settings.BATCH_MAX_REQUESTS} sub-peticiones.')
+        return value
+
+
+def build_subrequest(parent, spec):
+    path, _, query = spec['path'].partition('?')
+    body = json.dumps(spec['body']).encode() if 'body' in spec else b''
+    meta = {key: value for key, value in parent.META.items() if key not in SUBREQUEST_OWN_HEADERS}
+    meta.update({
+        'REQUEST_METHOD': spec['method'],
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+    })
+    meta.pop('wsgi.input', None)
+    for name, value in spec.get('headers', {}).items():
+        meta['HTTP_' + name.upper().replace('-', '_')] = value
+
+    request = HttpRequest()
+    request.method = spec['method']
+    request.path = request.path_info = path
+    request.META = meta
+    request.GET = QueryDict(query)
+    request.COOKIES = parent.COOKIES
+    request._stream = io.BytesIO(body)
+    request._read_started = False
+    request.user = parent.user
+    request._force_auth_user = parent.user
+    request._force_auth_token = parent.auth
+    return request
+
+
+def resolve_api_view(path, batch_view_class):
+    """ResolverMatch de ``path`` si es una vista que el batch puede despachar, o None."""
+    if not path.startswith(API_PREFIX):
+        return None
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return None
+    view_class = getattr(match.func, 'cls', None)
+    if (view_class is None or not issubclass(view_class, APIView) or view_class is batch_view_class
+            or view_class.view_is_async):
+        return None
+    return match
+
+
+def run_subrequest(parent, spec, batch_view_class):
+    started = time.perf_counter()
+    result = {'id': spec['id']} if 'id' in spec else {}
+    match = resolve_api_view(spec['path'].partition('?')[0], batch_view_class)
+    if match is None:
+        result.update(status=404, body={'error': 'Ruta no encontrada.'})
+    else:
+        try:
+            request = build_subrequest(parent, spec)
+            request.resolver_match = match
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+            result.update(
+                status=response.status_code,
+                headers={name: response[name] for name in RETURNED_HEADERS if response.has_header(name)},
+                body=response_body(response),
+            )
+        except Exception:
+            # Un fallo en una sub-petición no tumba las demás
+            logger.exception('Error en la sub-petición %s %s', spec['method'], spec['path'])
+            result.update(status=500, body={'error': 'Error interno en la sub-petición.'})
+    result['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def response_body(response):
+    if hasattr(response, 'data'):
+        return response.data
+    content = getattr(response, 'content', b'')
+    if not content:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        return content.decode(response.charset, errors='replace')
+
+
+def run_in_thread(parent, spec, batch_view_class):
+    try:
+        return run_subrequest(parent, spec, batch_view_class)
+    finally:
+        # Cada hilo abre sus propias conexiones; se cierran al terminar
+        connections.close_all()
+
+
+def run_batch(parent, specs, batch_view_class):
+    """Resultados de ``specs`` en orden; los grupos de lecturas consecutivas van en paralelo."""
+    # Dentro de una transacción (ATOMIC_REQUESTS, tests) otros hilos no verían
+    # sus datos: en ese caso todo se ejecuta en este hilo.
+    workers = 1 if connection.in_atomic_block else settings.BATCH_MAX_WORKERS
+    results = []
+    index = 0
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        while index < len(specs):
+            if specs[index]['method'] not in READ_METHODS or workers == 1:
+                results.append(run_subrequest(parent, specs[index], batch_view_class))
+                index += 1
+                continue
+            end = index
+            while end < len(specs) and specs[end]['method'] in READ_METHODS:
+                end += 1
+            results.extend(executor.map(lambda spec: run_in_thread(parent, spec, batch_view_class), specs[index:end]))
+            index = end
+    return results
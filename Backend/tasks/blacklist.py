@@ -0,0 +1,145 @@
+"""
+Lista negra de refresh tokens (logout) sin la app token_blacklist de simplejwt.
+
+Los jti revocados se guardan en BlacklistedToken (jti + caducidad) y, en cada
+proceso, en un filtro de Bloom en memoria. Comprobar un token que no está en
+el filtro (el caso normal) no consulta la base de datos; solo los positivos del
+filtro, que son los tokens revocados y una fracción BLACKLIST_FILTER_ERROR_RATE
+de falsos positivos, se confirman con una lectura por clave primaria.
+
+Cada proceso incorpora cada BLACKLIST_SYNC_INTERVAL segundos las filas creadas
+por los demás, y cada BLACKLIST_PRUNE_INTERVAL segundos (en la primera
+comprobación o logout pasado ese tiempo) borra las filas de tokens ya caducados
+y reconstruye su filtro sin ellas. El filtro se dimensiona para al menos el
+doble de las filas vivas, así que superar BLACKLIST_FILTER_CAPACITY no lo hace
+reconstruirse en cada petición.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import BlacklistedToken
+
+# Margen al sincronizar, para filas de transacciones que confirmaron tarde
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        # Doble hashing (Kirsch-Mitzenmacher) sobre un único blake2b
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
+
+
+class TokenBlacklist:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.high_water = None
+        self.synced_at = 0.0
+        self.pruned_at = time.monotonic()
+
+    def new_filter(self, rows=0):
+        # Con holgura para las filas ya vivas: si no, cada sync volvería a reconstruirlo
+        capacity = max(settings.BLACKLIST_FILTER_CAPACITY, 2 * rows)
+        return BloomFilter(capacity, settings.BLACKLIST_FILTER_ERROR_RATE)
+
+    def load(self, rows):
+        for jti, created_at in rows:
+            self.filter.add(jti)
+            if self.high_water is None or created_at > self.high_water:
+                self.high_water = created_at
+
+    def rebuild(self):
+        rows = list(BlacklistedToken.objects.filter(expires_at__gt=timezone.now()).values_list('jti', 'created_at'))
+        self.filter = self.new_filter(len(rows))
+        self.high_water = None
+        self.load(rows)
+        self.synced_at = time.monotonic()
+
+    def sync(self):
+        if time.monotonic() - self.pruned_at >= settings.BLACKLIST_PRUNE_INTERVAL:
+            # prune() también reconstruye el filtro
+            self.prune()
+            return
+        with self.lock:
+            if self.filter is None or self.filter.count > self.filter.capacity:
+                self.rebuild()
+            elif time.monotonic() - self.synced_at >= settings.BLACKLIST_SYNC_INTERVAL:
+                rows = BlacklistedToken.objects.filter(expires_at__gt=timezone.now())
+                if self.high_water is not None:
+                    rows = rows.filter(created_at__gte=self.high_water - SYNC_OVERLAP)
+                self.load(rows.values_list('jti', 'created_at'))
+                self.synced_at = time.monotonic()
+
+    def add(self, jti, expires_at):
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(jti=jti, expires_at=expires_at)], ignore_conflicts=True,
+        )
+        self.sync()
+        with self.lock:
+            self.filter.add(jti)
+
+    def contains(self, jti):
+        self.sync()
+        if jti not in self.filter:
+            return False
+        return BlacklistedToken.objects.filter(jti=jti, expires_at__gt=timezone.now()).exists()
+
+    def prune(self):
+        """Borra las filas de tokens caducados y reconstruye el filtro; devuelve cuántas borró."""
+        # Antes de borrar: los demás hilos del proceso no repiten la poda mientras tanto
+        self.pruned_at = time.monotonic()
+        deleted, _rows = BlacklistedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        with self.lock:
+            self.rebuild()
+        return deleted
+
+    def reset(self):
+        with self.lock:
+            self.filter = None
+            self.high_water = None
+            self.pruned_at = time.monotonic()
+
+
+token_blacklist = TokenBlacklist()
+
+
+class BlacklistableRefreshToken(RefreshToken):
+    """RefreshToken cuya lista negra es token_blacklist."""
+
+    def verify(self, *args, **kwargs):
+        # Primero firma y caducidad: un token caducado no llega a mirar la lista negra
+        super().verify(*args, **kwargs)
+        if token_blacklist.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        token_blacklist.add(self.payload[api_settings.JTI_CLAIM], datetime_from_epoch(self.payload['exp']))
@@ -0,0 +1,181 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Tag, Task, TaskCollectionVersion
+from .search import refresh_search_vectors
+
+
+def bulk_tasks_changed(user_ids, task_ids=None):
+    """
+    Lo que las señales de tasks.signals harían por cada tarea, en una consulta por
+    efecto, para las escrituras masivas (bulk_create, update(), los DELETE de la
+    tabla intermedia) que no emiten señales: versión de la colección de cada
+    usuario y search_vector.
+    """
+    TaskCollectionVersion.objects.bump(user_ids)
+    if task_ids:
+        refresh_search_vectors(Task.objects.filter(pk__in=task_ids))
+
+
+def resolve_tag_names(items):
+    """
+    Sustituye la clave ``tag_names`` de cada elemento validado por sus Tag, que se
+    añaden a ``tags``. Los nombres de todo el lote se resuelven (y las etiquetas
+    nuevas se crean) con un solo Tag.objects.upsert.
+    """
+    tags_by_name = Tag.objects.upsert(name for item in items for name in item.get('tag_names', ()))
+    for item in items:
+        if 'tag_names' in item:
+            named = [tags_by_name[name] for name in item.pop('tag_names')]
+            item['tags'] = list(dict.fromkeys([*item.get('tags', ()), *named]))
+    return items
+
+
+def set_task_tags(tags_by_task):
+    """Sustituye las etiquetas de varias tareas con un DELETE y un INSERT en la tabla intermedia."""
+    through = Task.tags.through
+    through.objects.filter(task_id__in=tags_by_task).delete()
+    through.objects.bulk_create([
+        through(task_id=task_id, tag_id=tag.pk)
+        for task_id, tags in tags_by_task.items()
+        for tag in tags
+    ], ignore_conflicts=True)
+
+
+def bulk_create_tasks(validated_data):
+    """
+    Inserta tareas ya validadas y sus etiquetas con un INSERT para las tareas y
+    otro para la tabla intermedia, sea cual sea el tamaño del lote.
+    """
+    resolve_tag_names(validated_data)
+    tasks = [
+        Task(**{field: value for field, value in item.items() if field != 'tags'})
+        for item in validated_data
+    ]
+    Task.objects.bulk_create(tasks)
+    set_task_tags({task.pk: item.get('tags', []) for task, item in zip(tasks, validated_data)})
+    bulk_tasks_changed({task.user_id for task in tasks}, [task.pk for task in tasks])
+    return tasks
+
+
+def bulk_update_tasks(user, validated_data):
+    """
+    Aplica cambios parciales a varias tareas de ``user``. Los cambios se agrupan
+    por (campo, valor) y los grupos que afectan a las mismas tareas se funden, de
+    modo que "marcar todo como hecho" es un solo UPDATE y mover tarjetas entre
+    columnas es un UPDATE por columna de destino. updated_at se actualiza en todas
+    las tareas del lote, igual que al guardar una instancia.
+    """
+    resolve_tag_names(validated_data)
+    now = timezone.now()
+    ids = set()
+    ids_by_change = defaultdict(set)
+    tags_by_task = {}
+    for item in validated_data:
+        changes = dict(item)
+        pk = changes.pop('id')
+        ids.add(pk)
+        if 'tags' in changes:
+            tags_by_task[pk] = changes.pop('tags')
+        for field, value in changes.items():
+            ids_by_change[field, value].add(pk)
+
+    changes_by_ids = defaultdict(dict)
+    for (field, value), change_ids in ids_by_change.items():
+        changes_by_ids[frozenset(change_ids)][field] = value
+    untouched = ids.difference(*changes_by_ids)
+    if untouched:
+        changes_by_ids[frozenset(untouched)] = {}
+
+    tasks = Task.objects.filter(user_id=user.pk)
+    for change_ids, changes in changes_by_ids.items():
+        tasks.filter(pk__in=change_ids).update(updated_at=now, version=F('version') + 1, **changes)
+    if tags_by_task:
+        set_task_tags(tags_by_task)
+
+    # El search_vector solo depende de la categoría y las etiquetas entre los campos editables
+    search_changed = tags_by_task or any(field == 'category' for field, _ in ids_by_change)
+    bulk_tasks_changed([user.pk], ids if search_changed else None)
+    return ids
+
+
+def bulk_delete_tasks(user, queryset, chunk_size=1000):
+    """
+    Borra las tareas de ``queryset`` (ya limitado a ``user``) en bloques de
+    ``chunk_size``, cada uno en su propia transacción, así una limpieza de
+    100.000 filas nunca mantiene bloqueos largos. Devuelve el número de tareas
+    borradas.
+    """
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            chunk = delete_task_chunk(queryset, chunk_size)
+            if not chunk:
+                return deleted
+            deleted += chunk
+            bulk_tasks_changed([user.pk])
+
+
+def delete_task_chunk(queryset, chunk_size):
+    """
+    Borra hasta ``chunk_size`` tareas de ``queryset``: un SELECT de ids, un DELETE
+    en la tabla intermedia de etiquetas y el borrado de las tareas. Debe llamarse
+    dentro de una transacción. Devuelve cuántas ha borrado.
+    """
+    ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+    if not ids:
+        return 0
+    Task.tags.through.objects.filter(task_id__in=ids).delete()
+    return delete_tasks(Task.objects.filter(pk__in=ids))
+
+
+def delete_tasks(tasks):
+    """
+    Borra ``tasks`` con QuerySet.delete(), que sigue todas las relaciones inversas
+    de Task. Las señales de Task obligan al Collector a cargar cada instancia: solo
+    se leen las columnas que usan sus receptores. Devuelve cuántas tareas ha borrado.
+    """
+    _, deleted = tasks.only('user_id').delete()
+    return deleted.get(Task._meta.label, 0)
+
+
+def tasks_matching(user, pk, versions):
+    tasks = Task.objects.filter(pk=pk, user_id=user.pk)
+    if versions != '*':
+        tasks = tasks.filter(version__in=versions)
+    return tasks
+
+
+def update_task_if_match(user, pk, versions, validated_data):
+    """
+    Aplica ``validated_data`` a la tarea ``pk`` de ``user`` con un único
+    UPDATE ... WHERE id = %s AND user_id = %s AND version IN (...), sin leerla
+    antes. Devuelve False si ninguna fila coincide (no existe, es de otro usuario
+    o su versión ha cambiado).
+    """
+    changes = resolve_tag_names([dict(validated_data)])[0]
+    tags = changes.pop('tags', None)
+    updated = tasks_matching(user, pk, versions).update(
+        updated_at=timezone.now(), version=F('version') + 1, **changes,
+    )
+    if not updated:
+        return False
+    if tags is not None:
+        set_task_tags({int(pk): tags})
+    search_changed = tags is not None or {'title', 'description', 'category'} & set(changes)
+    bulk_tasks_changed([user.pk], [pk] if search_changed else None)
+    return True
+
+
+def delete_task_if_match(user, pk, versions):
+    """Borra la tarea si su versión coincide; False si no existe, es de otro usuario o ha cambiado."""
+    tasks = tasks_matching(user, pk, versions)
+    # La subconsulta solo quita las etiquetas si la versión coincide
+    Task.tags.through.objects.filter(task__in=tasks).delete()
+    if not delete_tasks(tasks):
+        return False
+    bulk_tasks_changed([user.pk])
+    return True
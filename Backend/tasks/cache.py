@@ -0,0 +1,59 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class TaskListCache:
+    """
+    Caché de las respuestas de TaskViewSet.list por usuario, filtros y página.
+
+    La clave incluye la versión de la colección de tareas del usuario
+    (TaskCollectionVersion), que las señales de tasks.signals incrementan con
+    cada escritura sobre sus tareas, etiquetas o categorías: tras una escritura
+    las entradas antiguas dejan de ser alcanzables y caducan solas.
+    """
+    key_prefix = 'tasks:list'
+    hits_key = 'tasks:list:stats:hits'
+    misses_key = 'tasks:list:stats:misses'
+
+    def __init__(self, alias=None, timeout=None):
+        self.alias = alias or settings.TASK_LIST_CACHE_ALIAS
+        self.timeout = timeout if timeout is not None else settings.TASK_LIST_CACHE_TIMEOUT
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, version, request):
+        # URL absoluta: los enlaces next/previous de la paginación incluyen el host
+        digest = hashlib.blake2b(request.build_absolute_uri().encode(), digest_size=16).hexdigest()
+        return f'{self.key_prefix}:{version.token}:{digest}'
+
+    def get(self, key):
+        data = self.cache.get(key)
+        self.incr(self.misses_key if data is None else self.hits_key)
+        return data
+
+    def set(self, key, data):
+        self.cache.set(key, data, self.timeout)
+
+    def incr(self, key):
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Contador todavía inexistente; add() no pisa uno creado por otro proceso
+            if not self.cache.add(key, 1, timeout=None):
+                self.cache.incr(key)
+
+    def stats(self):
+        """Aciertos y fallos desde el último reset() (ver el comando task_list_cache_stats)."""
+        values = self.cache.get_many([self.hits_key, self.misses_key])
+        hits, misses = values.get(self.hits_key, 0), values.get(self.misses_key, 0)
+        return {'hits': hits, 'misses': misses, 'hit_rate': hits / (hits + misses) if hits + misses else None}
+
+    def reset_stats(self):
+        self.cache.delete_many([self.hits_key, self.misses_key])
+
+
+task_list_cache = TaskListCache()
@@ -0,0 +1,76 @@
+import hashlib
+import time
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags
+
+from .models import TaskCollectionVersion
+
+
+class ConditionalGetMixin:
+    """
+    GET condicional (ETag / Last-Modified) a partir de la versión de la colección
+    de tareas del usuario. La vista envuelve sus handlers con conditional_response.
+
+    Comprobar la versión es una lectura por clave primaria; si el cliente ya tiene
+    la representación actual se responde 304 sin consultar ni serializar tareas.
+    """
+
+    def get_collection_version(self, request):
+        return TaskCollectionVersion.objects.current(request.user.pk)
+
+    def get_etag(self, request, version):
+        # La representación depende de la URL completa (filtros, página, ?fields=) y del formato
+        key = f'{version.token}:{request.get_full_path()}:{request.accepted_media_type}'
+        return 'W/"%s"' % hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        version = self.collection_version = self.get_collection_version(request)
+        return self.evaluate_conditions(
+            request, self.get_etag(request, version), version, lambda: handler(request, *args, **kwargs)
+        )
+
+    def evaluate_conditions(self, request, etag, version, render):
+        last_modified = int(version.changed_at.timestamp())
+        # Last-Modified tiene resolución de segundos: mientras no termine el segundo del
+        # último cambio, otra escritura en ese mismo segundo no lo movería y un
+        # If-Modified-Since la daría por vista. Hasta entonces solo se envía el ETag.
+        if last_modified >= int(time.time()):
+            last_modified = None
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = render()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ('Accept', 'Authorization'))
+        return response
+
+
+def if_match_versions(request):
+    """
+    Versiones de tarea aceptadas por la cabecera If-Match: None si no se envía,
+    ``'*'`` para cualquiera, o un conjunto de enteros. Las etiquetas débiles
+    (W/"...") y las que no son una versión no coinciden nunca, como exige la
+    comparación fuerte de If-Match.
+    """
+    header = request.headers.get('If-Match')
+    if header is None:
+        return None
+    etags = parse_etags(header)
+    if etags == ['*']:
+        return '*'
+    return {int(etag[1:-1]) for etag in etags if etag[1:-1].isdigit() and etag.startswith('"')}
+
+
+# Versión de la tarea en las respuestas de detalle y de escritura, con el formato
+# que acepta If-Match. No es el ETag: este identifica la representación (formato,
+# ?fields=, nombres de etiquetas y categoría), no solo la fila de la tarea.
+TASK_VERSION_HEADER = 'Task-Version'
+
+
+def version_etag(version):
+    return f'"{version}"'
+
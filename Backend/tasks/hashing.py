@@ -0,0 +1,89 @@
+"""
+Pool acotado de hilos para el trabajo de autenticación (hashing de contraseñas).
+
+Bajo ASGI, sync_to_async ejecuta el código síncrono en un único hilo
+compartido: un login (PBKDF2, cientos de ms de CPU) retrasaría a las demás
+vistas síncronas del worker. Las vistas asíncronas de login, cambio y
+restablecimiento de contraseña envían ese trabajo a este pool, que tiene su
+propio límite de hilos (PASSWORD_HASH_WORKERS) y de trabajos en curso o en
+cola (PASSWORD_HASH_MAX_PENDING). Al llegar al límite la petición se rechaza al
+momento con 503 en lugar de encolarse sin fin.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework import exceptions, status
+
+
+class HashingPoolBusy(exceptions.APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Demasiadas peticiones de autenticación en curso. Inténtalo de nuevo en unos segundos.'
+    default_code = 'hashing_busy'
+
+
+class PasswordHashingPool:
+    def __init__(self, max_workers=None, max_pending=None):
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self):
+        return self._max_workers if self._max_workers is not None else settings.PASSWORD_HASH_WORKERS
+
+    @property
+    def max_pending(self):
+        return self._max_pending if self._max_pending is not None else settings.PASSWORD_HASH_MAX_PENDING
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='password-hash')
+            return self._executor
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def acquire(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            return True
+
+    def release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func, *args, **kwargs):
+        """Ejecuta ``func(*args, **kwargs)`` en el pool; HashingPoolBusy si está lleno."""
+        if not self.acquire():
+            raise HashingPoolBusy()
+        try:
+            # Con el contexto actual (idioma activo, etc.), como hace sync_to_async
+            future = self.executor.submit(contextvars.copy_context().run, self.call, func, args, kwargs)
+        except BaseException:
+            self.release()
+            raise
+        # El hueco se libera cuando el hilo termina, aunque el cliente se haya ido antes
+        future.add_done_callback(self.release)
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def call(func, args, kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # Las conexiones de cada hilo se reciclan como al final de una petición (CONN_MAX_AGE)
+            close_old_connections()
+
+
+password_hashing = PasswordHashingPool()
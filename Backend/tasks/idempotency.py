@@ -0,0 +1,127 @@
+import functools
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import QueryDict
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+# Cabeceras de la respuesta original que se devuelven también al repetirla
+REPLAYED_HEADERS = ('Location', 'ETag')
+
+
+class IdempotencyStore:
+    """
+    Resultado de las peticiones con cabecera Idempotency-Key, guardado en la caché
+    durante IDEMPOTENCY_KEY_TTL segundos.
+
+    Cada clave es propia del usuario (o, en peticiones anónimas como el registro,
+    de la IP del cliente), del método y de la ruta. Mientras la primera petición se ejecuta la clave guarda una marca "en
+    curso" creada con cache.add(), así que un reintento concurrente recibe 409 en
+    lugar de ejecutar la escritura otra vez.
+    """
+    key_prefix = 'idempotency'
+
+    def __init__(self, alias=None, timeout=None, lock_timeout=None):
+        self.alias = alias or settings.IDEMPOTENCY_CACHE_ALIAS
+        self.timeout = timeout if timeout is not None else settings.IDEMPOTENCY_KEY_TTL
+        self.lock_timeout = lock_timeout if lock_timeout is not None else settings.IDEMPOTENCY_LOCK_TIMEOUT
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def make_key(self, request, idempotency_key):
+        user = request.user
+        if user and user.is_authenticated:
+            scope = user.pk
+        else:
+            # Sin usuario, la clave de un cliente no debe devolver la respuesta guardada a otro
+            ident = BaseThrottle().get_ident(request)
+            scope = 'anon-' + hashlib.blake2b(ident.encode(), digest_size=16).hexdigest()
+        digest = hashlib.blake2b(idempotency_key.encode(), digest_size=16).hexdigest()
+        return f'{self.key_prefix}:{scope}:{request.method}:{request.path}:{digest}'
+
+    def fingerprint(self, request):
+        # Huella de la petición (query string y cuerpo ya parseado) para detectar
+        # la misma clave reutilizada con otros datos
+        data = request.data
+        if isinstance(data, QueryDict):
+            data = dict(data.lists())
+        payload = json.dumps([request.query_params.urlencode(), data], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def lock(self, key, fingerprint):
+        return self.cache.add(key, {'fingerprint': fingerprint, 'in_progress': True}, self.lock_timeout)
+
+    def save(self, key, fingerprint, response):
+        self.cache.set(key, {
+            'fingerprint': fingerprint,
+            'status': response.status_code,
+            'data': response.data,
+            'headers': {name: response[name] for name in REPLAYED_HEADERS if response.has_header(name)},
+        }, self.timeout)
+
+    def release(self, key):
+        self.cache.delete(key)
+
+
+idempotency_store = IdempotencyStore()
+
+
+def stored_response(stored, fingerprint):
+    if stored['fingerprint'] != fingerprint:
+        return Response({'error': 'Esta Idempotency-Key ya se usó con otra petición.'},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    if stored.get('in_progress'):
+        return Response({'error': 'Ya se está procesando una petición con esta Idempotency-Key.'},
+                        status=status.HTTP_409_CONFLICT)
+    response = Response(stored['data'], status=stored['status'], headers=stored['headers'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(handler):
+    """
+    Decorador para handlers de escritura (create, acciones bulk). Con cabecera
+    Idempotency-Key, un reintento con la misma clave devuelve la respuesta guardada
+    de la primera petición sin volver a validar ni insertar nada. Las peticiones
+    que terminan en excepción (errores de validación, 5xx) no se guardan y se
+    pueden reintentar.
+    """
+    @functools.wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if idempotency_key is None:
+            return handler(self, request, *args, **kwargs)
+        if not idempotency_key or len(idempotency_key) > 255:
+            return Response({'error': 'Idempotency-Key debe tener entre 1 y 255 caracteres.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        key = idempotency_store.make_key(request, idempotency_key)
+        fingerprint = idempotency_store.fingerprint(request)
+        stored = idempotency_store.get(key)
+        if stored is not None:
+            return stored_response(stored, fingerprint)
+        if not idempotency_store.lock(key, fingerprint):
+            # Otra petición con la misma clave ha llegado entre el get() y el add()
+            return stored_response(idempotency_store.get(key) or {'fingerprint': fingerprint, 'in_progress': True},
+                                   fingerprint)
+        try:
+            response = handler(self, request, *args, **kwargs)
+        except Exception:
+            idempotency_store.release(key)
+            raise
+        if response.status_code < 500:
+            idempotency_store.save(key, fingerprint, response)
+        else:
+            idempotency_store.release(key)
+        return response
+    return wrapper
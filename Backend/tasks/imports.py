@@ -0,0 +1,329 @@
+"""
+Importación masiva de tareas desde CSV o JSON Lines, para el comando
+``import_tasks`` y para POST /api/tasks/import/.
+
+El archivo se lee en streaming y se procesa por lotes de ``batch_size`` filas:
+cada lote se valida, resuelve los nombres de categoría y etiquetas contra una
+caché en memoria (creando los que falten) y se carga en su propia transacción.
+En PostgreSQL la carga pasa por COPY a tablas temporales de staging y de ahí a
+tasks_task / tasks_task_tags con un INSERT ... SELECT; en el resto de motores
+se usa bulk_create. La memoria no depende del tamaño del archivo: solo se
+guarda el lote en curso, las cachés de nombres y los primeros errores.
+"""
+import csv
+import io
+import json
+import time
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .bulk import bulk_tasks_changed
+from .models import Category, Tag, Task
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+# En CSV las etiquetas van en una sola columna: "Urgente|Casa"
+CSV_TAG_SEPARATOR = '|'
+PRIORITY_DEFAULT = Task._meta.get_field('priority').default
+STATUS_DEFAULT = Task._meta.get_field('status').default
+
+
+class ImportTagNamesField(serializers.ListField):
+    child = serializers.CharField(max_length=50)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [name for name in data.split(CSV_TAG_SEPARATOR) if name.strip()]
+        return super().to_internal_value(data)
+
+
+class TaskImportRowSerializer(serializers.Serializer):
+    """
+    Una fila del archivo. A diferencia de TaskSerializer, la categoría y las
+    etiquetas vienen por nombre y se admiten fechas pasadas (datos heredados).
+    """
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    due_date = serializers.DateField(required=False, allow_null=True)
+    priority = serializers.ChoiceField(choices=Task._meta.get_field('priority').choices, required=False)
+    status = serializers.ChoiceField(choices=Task._meta.get_field('status').choices, required=False)
+    category = serializers.CharField(max_length=100, required=False, allow_null=True)
+    tags = ImportTagNamesField(required=False)
+
+
+def detect_format(filename):
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return None
+
+
+class ImportFileError(Exception):
+    """El archivo no se puede seguir leyendo (codificación o CSV mal formado) a partir de ``line``."""
+
+    def __init__(self, line, message):
+        super().__init__(message)
+        self.line = line
+        self.message = message
+
+
+def file_error_message(exc):
+    if isinstance(exc, UnicodeDecodeError):
+        return 'El archivo no está codificado en UTF-8.'
+    return f'CSV inválido: {exc}'
+
+
+def decode_lines(stream):
+    """
+    Decodifica un stream binario línea a línea en UTF-8 (con o sin BOM), para
+    saber en qué línea está un byte inválido. Un carácter UTF-8 de varios bytes
+    nunca contiene b'\\n', así que partir antes de decodificar es seguro.
+    """
+    for line_number, raw in enumerate(stream, 1):
+        try:
+            yield raw.decode('utf-8-sig' if line_number == 1 else 'utf-8')
+        except UnicodeDecodeError as exc:
+            raise ImportFileError(line_number, file_error_message(exc))
+
+
+def read_rows(stream, file_format):
+    """
+    Genera ``(línea, datos, errores)`` por cada fila de ``stream`` (binario o de
+    texto). Las filas que no se pueden leer llevan los errores y datos None; si
+    el archivo deja de poder leerse, lanza ImportFileError.
+    """
+    text = stream if isinstance(stream, io.TextIOBase) else decode_lines(stream)
+    if file_format == 'csv':
+        reader = csv.DictReader(text)
+        try:
+            for row in reader:
+                # Las celdas vacías cuentan como campos no enviados
+                data = {key.strip(): value for key, value in row.items() if key and value not in ('', None)}
+                yield reader.line_num, data, None
+        except (UnicodeDecodeError, csv.Error) as exc:
+            # line_num todavía no cuenta la línea que ha fallado
+            raise ImportFileError(reader.line_num + 1, file_error_message(exc))
+    elif file_format == 'jsonl':
+        line_number = 0
+        try:
+            for line_number, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as exc:
+                    yield line_number, None, {'non_field_errors': [f'JSON inválido: {exc}']}
+                    continue
+                if not isinstance(data, dict):
+                    yield line_number, None, {'non_field_errors': ['Cada línea debe ser un objeto JSON.']}
+                    continue
+                yield line_number, data, None
+        except UnicodeDecodeError as exc:
+            raise ImportFileError(line_number + 1, file_error_message(exc))
+    else:
+        raise ValueError(f'Formato de importación desconocido: {file_format}')
+
+
+class ImportReport:
+    """Contadores de una importación y los primeros ``max_errors`` errores por fila."""
+
+    def __init__(self, max_errors=100):
+        self.max_errors = max_errors
+        self.rows_read = 0
+        self.rows_imported = 0
+        self.rows_failed = 0
+        self.errors = []
+        # Error que detuvo la lectura del archivo; los lotes anteriores ya quedaron cargados
+        self.file_error = None
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add_error(self, line_number, errors):
+        self.rows_failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line_number, 'errors': errors})
+
+    def set_file_error(self, line_number, message):
+        self.file_error = {'line': line_number, 'error': message}
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'rows_read': self.rows_read,
+            'rows_imported': self.rows_imported,
+            'rows_failed': self.rows_failed,
+            'seconds': round(self.elapsed, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+            'errors': self.errors,
+            'file_error': self.file_error,
+        }
+
+
+class TaskImporter:
+    """
+    Importa tareas para ``user``. ``on_error(línea, errores)`` recibe todos los
+    errores por fila y ``on_batch(report)`` se llama tras cada lote cargado.
+    """
+    batch_size = 5000
+    staging_table = 'tasks_import_task'
+    staging_tags_table = 'tasks_import_task_tag'
+
+    def __init__(self, user, batch_size=None, on_error=None, on_batch=None, max_errors=100):
+        self.user = user
+        self.batch_size = batch_size or self.batch_size
+        self.on_error = on_error
+        self.on_batch = on_batch
+        self.report = ImportReport(max_errors)
+        # Un solo serializer para todas las filas, como hace ListSerializer con su child
+        self.row_serializer = TaskImportRowSerializer()
+        # nombre -> id; crecen con los nombres distintos, no con las filas
+        self.category_ids = {}
+        self.tag_ids = {}
+
+    def run(self, stream, file_format):
+        rows = read_rows(stream, file_format)
+        while True:
+            batch = []
+            try:
+                batch.extend(islice(rows, self.batch_size))
+            except ImportFileError as exc:
+                # Se cargan las filas leídas antes del error y la importación se detiene
+                self.report.set_file_error(exc.line, exc.message)
+            if batch:
+                self.import_batch(batch)
+            if not batch or self.report.file_error is not None:
+                break
+            self.report.elapsed = time.perf_counter() - self.report.started
+            if self.on_batch is not None:
+                self.on_batch(self.report)
+        self.report.elapsed = time.perf_counter() - self.report.started
+        return self.report
+
+    def import_batch(self, batch):
+        self.report.rows_read += len(batch)
+        rows = []
+        for line_number, data, errors in batch:
+            if errors is None:
+                try:
+                    rows.append(self.row_serializer.run_validation(data))
+                    continue
+                except serializers.ValidationError as exc:
+                    errors = exc.detail
+            self.fail(line_number, errors)
+        if not rows:
+            return
+        self.resolve_names(rows)
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                task_ids = self.copy_rows(rows)
+            else:
+                task_ids = self.create_rows(rows)
+            bulk_tasks_changed([self.user.pk], task_ids)
+        self.report.rows_imported += len(rows)
+
+    def fail(self, line_number, errors):
+        self.report.add_error(line_number, errors)
+        if self.on_error is not None:
+            self.on_error(line_number, errors)
+
+    def resolve_names(self, rows):
+        for model, cache, names in (
+            (Category, self.category_ids, {row['category'] for row in rows if row.get('category')}),
+            (Tag, self.tag_ids, {name for row in rows for name in row.get('tags', ())}),
+        ):
+            missing = names - cache.keys()
+            if missing:
+                cache.update((name, obj.pk) for name, obj in model.objects.upsert(missing).items())
+
+    def task_values(self, row):
+        return {
+            'title': row['title'],
+            'description': row.get('description'),
+            'due_date': row.get('due_date'),
+            'priority': row.get('priority', PRIORITY_DEFAULT),
+            'status': row.get('status', STATUS_DEFAULT),
+            'category_id': self.category_ids[row['category']] if row.get('category') else None,
+        }
+
+    def create_rows(self, rows):
+        tasks = Task.objects.bulk_create([Task(user_id=self.user.pk, **self.task_values(row)) for row in rows])
+        through = Task.tags.through
+        through.objects.bulk_create([
+            through(task_id=task.pk, tag_id=self.tag_ids[name])
+            for task, row in zip(tasks, rows)
+            for name in row.get('tags', ())
+        ], ignore_conflicts=True)
+        return [task.pk for task in tasks]
+
+    def copy_rows(self, rows):
+        """
+        Carga el lote con COPY en las tablas temporales y lo pasa a las tablas
+        reales con dos INSERT ... SELECT. Los ids se reservan antes en la
+        secuencia de tasks_task para poder enlazar las etiquetas en staging.
+        """
+        task_table = Task._meta.db_table
+        through = Task.tags.through._meta.db_table
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            self.create_staging_tables(cursor)
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+                [task_table, 'id', len(rows)],
+            )
+            task_ids = [pk for pk, in cursor.fetchall()]
+            columns = ('id', 'title', 'description', 'due_date', 'priority', 'status', 'category_id')
+            copy_to(cursor, self.staging_table, columns, (
+                (pk, *self.task_values(row).values()) for pk, row in zip(task_ids, rows)
+            ))
+            copy_to(cursor, self.staging_tags_table, ('task_id', 'tag_id'), (
+                (pk, self.tag_ids[name])
+                for pk, row in zip(task_ids, rows)
+                for name in row.get('tags', ())
+            ))
+            cursor.execute(
+                f'INSERT INTO {task_table} (id, user_id, title, description, due_date, priority, status, '
+                f'category_id, created_at, updated_at, version) '
+                f'SELECT id, %s, title, description, due_date, priority, status, category_id, %s, %s, 1 '
+                f'FROM {self.staging_table}',
+                [self.user.pk, now, now],
+            )
+            cursor.execute(
+                f'INSERT INTO {through} (task_id, tag_id) '
+                f'SELECT DISTINCT task_id, tag_id FROM {self.staging_tags_table}'
+            )
+        return task_ids
+
+    def create_staging_tables(self, cursor):
+        # ON COMMIT DELETE ROWS: cada lote (una transacción) empieza con el staging vacío
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE IF NOT EXISTS {self.staging_table} ('
+            f'id bigint, title varchar(200), description text, due_date date, '
+            f'priority varchar(10), status varchar(20), category_id bigint'
+            f') ON COMMIT DELETE ROWS'
+        )
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE IF NOT EXISTS {self.staging_tags_table} ('
+            f'task_id bigint, tag_id bigint'
+            f') ON COMMIT DELETE ROWS'
+        )
+
+
+def copy_to(cursor, table, columns, rows):
+    """COPY ... FROM STDIN en formato CSV; None se envía como NULL (campo vacío sin comillas)."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    sql = f'COPY {table} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)'
+    raw = cursor.cursor
+    if hasattr(raw, 'copy_expert'):  # psycopg2
+        raw.copy_expert(sql, buffer)
+    else:  # psycopg 3
+        with raw.copy(sql) as copy:
+            copy.write(buffer.getvalue())
@@ -0,0 +1,59 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.imports import IMPORT_FORMATS, TaskImporter, detect_format
+
+
+class Command(BaseCommand):
+    help = 'Importa tareas desde un archivo CSV o JSON Lines para un usuario.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Archivo .csv, .jsonl o .ndjson')
+        parser.add_argument('--user', required=True, help='Nombre de usuario propietario de las tareas')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Por defecto se deduce de la extensión')
+        parser.add_argument('--batch-size', type=int, default=TaskImporter.batch_size)
+        parser.add_argument('--errors', help='Escribe los errores por fila en este archivo (JSON Lines)')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"No existe el usuario {options['user']}.")
+        file_format = options['format'] or detect_format(options['path'])
+        if file_format is None:
+            raise CommandError('No se puede deducir el formato del archivo; usa --format.')
+
+        errors_file = open(options['errors'], 'w', encoding='utf-8') if options['errors'] else None
+
+        def on_error(line_number, errors):
+            record = json.dumps({'line': line_number, 'errors': errors}, ensure_ascii=False)
+            if errors_file is not None:
+                errors_file.write(record + '\n')
+            else:
+                self.stderr.write(record)
+
+        def on_batch(report):
+            self.stdout.write(
+                f'{report.rows_read} filas leídas, {report.rows_imported} importadas, '
+                f'{report.rows_failed} con errores ({report.rows_per_second:.0f} filas/s)'
+            )
+
+        importer = TaskImporter(user, batch_size=options['batch_size'], on_error=on_error, on_batch=on_batch)
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = importer.run(stream, file_format)
+        finally:
+            if errors_file is not None:
+                errors_file.close()
+        style = self.style.WARNING if report.file_error is not None else self.style.SUCCESS
+        self.stdout.write(style(
+            f'Importadas {report.rows_imported} de {report.rows_read} filas en {report.elapsed:.1f} s '
+            f'({report.rows_per_second:.0f} filas/s); {report.rows_failed} con errores.'
+        ))
+        if report.file_error is not None:
+            raise CommandError(
+                f"Importación detenida en la línea {report.file_error['line']}: {report.file_error['error']}"
+            )
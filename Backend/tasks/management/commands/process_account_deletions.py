@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.accounts import DELETION_CHUNK_SIZE, pending_deletions, process_account_deletion
+
+
+class Command(BaseCommand):
+    help = 'Worker que borra en segundo plano las cuentas pendientes (tasks.accounts).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DELETION_CHUNK_SIZE)
+        parser.add_argument('--once', action='store_true', help='Procesa lo pendiente y termina')
+        parser.add_argument('--sleep', type=float, default=5.0, help='Segundos de espera sin trabajo')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = False
+            for deletion_id in list(pending_deletions().values_list('pk', flat=True)):
+                deletion = process_account_deletion(deletion_id, options['chunk_size'], on_progress=self.report)
+                if deletion is not None:
+                    processed = True
+                    self.stdout.write(self.style.SUCCESS(f'Cuenta {deletion.username} borrada.'))
+            if options['once']:
+                return
+            # También si todo lo pendiente lo tienen otros workers: sin esto el bucle no espera nunca
+            if not processed:
+                time.sleep(options['sleep'])
+
+    def report(self, deletion):
+        self.stdout.write(
+            f'{deletion.username}: {deletion.deleted_tasks}/{deletion.total_tasks} tareas '
+            f'({deletion.progress:.0%})'
+        )
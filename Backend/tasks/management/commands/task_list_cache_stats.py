@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from tasks.cache import task_list_cache
+
+
+class Command(BaseCommand):
+    help = 'Muestra los aciertos y fallos de la caché del listado de tareas (TaskListCache).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Pone los contadores a cero después de mostrarlos')
+
+    def handle(self, *args, **options):
+        stats = task_list_cache.stats()
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats['hit_rate'] is not None else 'sin peticiones'
+        self.stdout.write(f"Aciertos: {stats['hits']}, fallos: {stats['misses']}, tasa de aciertos: {hit_rate}")
+        if options['reset']:
+            task_list_cache.reset_stats()
+            self.stdout.write('Contadores puestos a cero.')
@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-16 21:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+from tasks.operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0008_userprofile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['user', 'status', 'due_date'], name='task_user_status_due_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['user', 'priority', 'due_date'], name='task_user_priority_due_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['user', 'category', 'due_date'], name='task_user_category_due_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['user', 'due_date', 'id'], name='task_user_due_id_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='task_user_updated_id_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'completed'), _negated=True), fields=['user', 'due_date'], name='task_user_open_due_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-16 22:00
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from tasks.operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0009_task_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # No hace nada fuera de PostgreSQL.
+        TrigramExtension(),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='task_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['description'], name='task_description_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-16 22:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from tasks.operations import AddIndexConcurrentlyIfSupported
+from tasks.search import refresh_search_vectors
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def backfill_search_vectors(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    last_id = 0
+    while True:
+        ids = list(
+            Task.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:BACKFILL_BATCH_SIZE]
+        )
+        if not ids:
+            break
+        refresh_search_vectors(Task.objects.filter(pk__gte=ids[0], pk__lte=ids[-1]))
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+    # El relleno va por lotes fuera de una única transacción y el índice se crea CONCURRENTLY.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0010_task_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='task_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import migrations
+
+INDEX_NAME = 'auth_user_email_ci_uniq'
+
+
+def create_index(apps, schema_editor):
+    # UPPER() como el iexact de Django, para que esas búsquedas también usen el índice.
+    # Los correos vacíos (email es opcional) no cuentan como duplicados.
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    concurrently = ' CONCURRENTLY' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        f"CREATE UNIQUE INDEX{concurrently} {schema_editor.quote_name(INDEX_NAME)} "
+        f"ON {schema_editor.quote_name(table)} (UPPER({schema_editor.quote_name('email')})) "
+        f"WHERE {schema_editor.quote_name('email')} <> ''"
+    )
+
+
+def drop_index(apps, schema_editor):
+    concurrently = ' CONCURRENTLY' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(f'DROP INDEX{concurrently} {schema_editor.quote_name(INDEX_NAME)}')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción.
+    # Falla si ya hay usuarios con el mismo correo salvo mayúsculas: hay que resolverlos antes.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0015_blacklistedtoken'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
 
 class User(AbstractUser):
     groups = models.ManyToManyField(
@@ -25,9 +28,28 @@ class User(AbstractUser):
         return self.username
 
 
+class UniqueNameManager(models.Manager):
+    """Manager de Category y Tag, cuyo ``name`` es único."""
+
+    def upsert(self, names):
+        """
+        Diccionario nombre -> objeto para ``names``, creando los que falten con un
+        INSERT ... ON CONFLICT DO NOTHING y un SELECT. La restricción unique de
+        ``name`` resuelve las carreras: si otra petición crea el mismo nombre a la
+        vez, el INSERT la ignora y el SELECT la encuentra.
+        """
+        names = set(names)
+        if not names:
+            return {}
+        self.bulk_create([self.model(name=name) for name in names], ignore_conflicts=True)
+        return self.in_bulk(names, field_name='name')
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
 
+    objects = UniqueNameManager()
+
     def __str__(self):
         return self.name
 
@@ -35,11 +57,13 @@ class Category(models.Model):
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
 
+    objects = UniqueNameManager()
+
     def __str__(self):
         return self.name
 
 class UserProfile(models.Model):
-    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='profile')  # MODIFICADO
     profile_picture = models.ImageField(upload_to='profile_pics/', null=True, blank=True)
 
     def __str__(self):
@@ -72,6 +96,130 @@ class Task(models.Model):
     tags = models.ManyToManyField(Tag, related_name='tasks')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # tsvector para /api/tasks/search/, lo mantienen las señales de tasks.signals (solo PostgreSQL)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Versión de la fila para la concurrencia optimista (If-Match en TaskViewSet)
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        # Índices para los filtros de TaskFilter y las ordenaciones de la paginación por cursor.
+        # Todos empiezan por user porque cada consulta está acotada a las tareas del usuario.
+        indexes = [
+            models.Index(fields=['user', 'status', 'due_date'], name='task_user_status_due_idx'),
+            models.Index(fields=['user', 'priority', 'due_date'], name='task_user_priority_due_idx'),
+            models.Index(fields=['user', 'category', 'due_date'], name='task_user_category_due_idx'),
+            models.Index(fields=['user', 'due_date', 'id'], name='task_user_due_id_idx'),
+            models.Index(fields=['user', 'updated_at', 'id'], name='task_user_updated_id_idx'),
+            models.Index(fields=['user', 'created_at', 'id'], name='task_user_created_id_idx'),
+            models.Index(
+                fields=['user', 'due_date'],
+                condition=~models.Q(status='completed'),
+                name='task_user_open_due_idx',
+            ),
+            # Trigramas (pg_trgm) para los filtros de subcadena title/description.
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='task_title_trgm_idx'),
+            GinIndex(fields=['description'], opclasses=['gin_trgm_ops'], name='task_description_trgm_idx'),
+            GinIndex(fields=['search_vector'], name='task_search_vector_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        super().save(*args, **kwargs)
+
+
+class TaskCollectionVersionManager(models.Manager):
+    def current(self, user_id):
+        version, _ = self.get_or_create(user_id=user_id, defaults={'changed_at': timezone.now()})
+        return version
+
+    def bump(self, user_ids):
+        """Marca como modificadas las colecciones de tareas de ``user_ids`` (lista o subconsulta)."""
+        # version distingue los cambios de un mismo segundo; ver ConditionalGetMixin.evaluate_conditions
+        return self.filter(user_id__in=user_ids).update(version=models.F('version') + 1, changed_at=timezone.now())
+
+
+class TaskCollectionVersion(models.Model):
+    """
+    Versión de la colección de tareas de un usuario, para ETag/Last-Modified.
+
+    Cambia con cualquier escritura que afecte a la representación de sus tareas
+    (tareas, sus etiquetas, o las categorías y etiquetas que usan); ver tasks.signals.
+    Consultarla es una lectura por clave primaria en lugar de la consulta del listado.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='task_collection_version'
+    )
+    version = models.PositiveBigIntegerField(default=1)
+    changed_at = models.DateTimeField()
+
+    objects = TaskCollectionVersionManager()
+
+    @property
+    def token(self):
+        # changed_at evita colisiones si la fila se recrea con el mismo user_id y version=1
+        return f'{self.user_id}:{self.version}:{self.changed_at.timestamp()}'
+
+    def __str__(self):
+        return f'{self.user_id}:{self.version}'
+
+
+class AccountDeletion(models.Model):
+    """
+    Borrado de una cuenta en segundo plano (ver tasks.accounts).
+
+    El usuario se desactiva al pedirlo y el worker (manage.py
+    process_account_deletions) borra sus tareas por bloques, guardando el
+    avance en la misma transacción que cada bloque: si el proceso se cae, al
+    reanudar continúa desde donde lo dejó. user_id no es una FK porque el
+    usuario se borra al final y el registro se conserva como historial.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+
+    user_id = models.BigIntegerField(unique=True)
+    username = models.CharField(max_length=150)
+    status = models.CharField(
+        max_length=10,
+        choices=[
+            (STATUS_PENDING, 'Pendiente'),
+            (STATUS_RUNNING, 'En curso'),
+            (STATUS_DONE, 'Terminado'),
+        ],
+        default=STATUS_PENDING,
+    )
+    total_tasks = models.PositiveIntegerField(default=0)
+    deleted_tasks = models.PositiveIntegerField(default=0)
+    requested_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'requested_at'], name='account_deletion_queue_idx')]
+
+    @property
+    def progress(self):
+        if self.status == self.STATUS_DONE:
+            return 1.0
+        if not self.total_tasks:
+            return 0.0
+        return min(self.deleted_tasks / self.total_tasks, 1.0)
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f'{self.username} ({self.get_status_display()})'
+
+
+class BlacklistedToken(models.Model):
+    """
+    Refresh token revocado (logout). Solo el jti y la caducidad del token: la fila
+    deja de servir cuando el token caduca y tasks.blacklist la borra entonces.
+    """
+    jti = models.CharField(max_length=64, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
@@ -0,0 +1,30 @@
+from django.contrib.postgres.indexes import PostgresIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db.migrations.operations import AddIndex
+
+
+def index_is_supported(index, connection):
+    """Los índices de django.contrib.postgres (GIN, GiST...) solo existen en PostgreSQL."""
+    return connection.vendor == 'postgresql' or not isinstance(index, PostgresIndex)
+
+
+class AddIndexConcurrentlyIfSupported(AddIndexConcurrently):
+    """
+    CREATE INDEX CONCURRENTLY en PostgreSQL (no bloquea escrituras en la tabla);
+    en otros motores, como el SQLite de los tests, un AddIndex normal, o nada si
+    el índice es específico de PostgreSQL.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            if index_is_supported(self.index, schema_editor.connection):
+                AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+            return
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            if index_is_supported(self.index, schema_editor.connection):
+                AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+            return
+        super().database_backwards(app_label, schema_editor, from_state, to_state)
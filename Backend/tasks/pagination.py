@@ -0,0 +1,199 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import BooleanField, Expression, F, Value
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class RowValueComparison(Expression):
+    """
+    ``(a, b) > (x, y)`` en SQL. A diferencia de ``a > x OR (a = x AND b > y)``,
+    el planificador puede usarla como límite de un recorrido del índice (a, b).
+    """
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, lhs, operator, rhs):
+        super().__init__()
+        self.lhs, self.operator, self.rhs = list(lhs), operator, list(rhs)
+
+    def get_source_expressions(self):
+        return [*self.lhs, *self.rhs]
+
+    def set_source_expressions(self, exprs):
+        self.lhs, self.rhs = exprs[:len(self.lhs)], exprs[len(self.lhs):]
+
+    def as_sql(self, compiler, connection):
+        sides, params = [], []
+        for side in (self.lhs, self.rhs):
+            parts = []
+            for expression in side:
+                sql, expression_params = compiler.compile(expression)
+                parts.append(sql)
+                params.extend(expression_params)
+            sides.append(', '.join(parts))
+        return f'({sides[0]}) {self.operator} ({sides[1]})', params
+
+
+class TaskKeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) para tareas.
+
+    Ordena por un campo estable más el id como desempate y pide la página
+    siguiente con ``(campo, id) > (valor, id)`` sobre la última fila entregada,
+    que recorre el índice (user, campo, id) desde ese punto: sin COUNT(*) ni
+    OFFSET, la página 5.000 cuesta lo mismo que la primera.
+
+    Los nulos van siempre al final y se recorren en una segunda fase, solo por
+    id: la comparación de filas no los incluye y un ``OR campo IS NULL`` impediría
+    usar el índice. La página que agota los valores no nulos se completa con una
+    consulta más sobre el bloque de nulos; si ya estaba llena, la última página
+    puede llegar vacía.
+    """
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+
+    # ordering -> (campo, parser del valor del cursor); cada campo tiene su índice (user, campo, id)
+    orderings = {
+        'due_date': ('due_date', parse_date),
+        'updated_at': ('updated_at', parse_datetime),
+        'created_at': ('created_at', parse_datetime),
+    }
+    default_ordering = 'due_date'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        self.cursor = self.decode_cursor(request)
+
+        field, _ = self.orderings[self.ordering.lstrip('-')]
+        descending = self.ordering.startswith('-')
+        nullable = queryset.model._meta.get_field(field).null
+        limit = self.page_size + 1
+
+        in_nulls = self.cursor is not None and self.cursor[0] is None
+        results = [] if in_nulls else list(self.get_values_queryset(queryset)[:limit])
+        if nullable and (in_nulls or len(results) < self.page_size):
+            nulls = queryset.filter(**{f'{field}__isnull': True}).order_by('-id' if descending else 'id')
+            if in_nulls:
+                nulls = nulls.filter(**{'id__lt' if descending else 'id__gt': self.cursor[1]})
+            results.extend(nulls[:limit - len(results)])
+            self.has_next = len(results) > self.page_size
+        else:
+            # Página llena con el último valor no nulo: puede quedar el bloque de nulos, que
+            # la página siguiente recorrerá sin consultarlo ahora solo para saber si existe
+            self.has_next = len(results) > self.page_size or (nullable and len(results) == self.page_size)
+        results = results[:self.page_size]
+        self.last = results[-1] if results else None
+        return results
+
+    def get_values_queryset(self, queryset):
+        """Primera fase: filas con valor no nulo a partir del cursor, en el orden del índice."""
+        field, _ = self.orderings[self.ordering.lstrip('-')]
+        descending = self.ordering.startswith('-')
+        if queryset.model._meta.get_field(field).null:
+            queryset = queryset.filter(**{f'{field}__isnull': False})
+        queryset = queryset.order_by(*self.get_order_by(field, descending))
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(queryset.model, field, descending, *self.cursor))
+        return queryset
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+        if ordering.lstrip('-') not in self.orderings:
+            return self.default_ordering
+        return ordering
+
+    def get_ordering_field(self, request):
+        field, _ = self.orderings[self.get_ordering(request).lstrip('-')]
+        return field
+
+    def get_order_by(self, field, descending):
+        # Mismo sentido en los dos campos: es el orden del índice, o su recorrido inverso
+        if descending:
+            return ['-' + field, '-id']
+        return [field, 'id']
+
+    def get_keyset_filter(self, model, field, descending, value, pk):
+        return RowValueComparison(
+            [F(field), F('id')],
+            '<' if descending else '>',
+            [Value(value, output_field=model._meta.get_field(field)), Value(pk, output_field=model._meta.pk)],
+        )
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        field, _ = self.orderings[self.ordering.lstrip('-')]
+        # Las filas pueden ser instancias de Task o diccionarios de values()
+        if isinstance(self.last, dict):
+            value, pk = self.last[field], self.last['id']
+        else:
+            value, pk = getattr(self.last, field), self.last.pk
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(value, pk))
+
+    def encode_cursor(self, value, pk):
+        payload = {
+            'o': self.ordering,
+            'v': value.isoformat() if value is not None else None,
+            'id': pk,
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode('ascii')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            if payload['o'] != self.ordering:
+                raise ValueError
+            _, parser = self.orderings[self.ordering.lstrip('-')]
+            value = payload['v']
+            if value is not None:
+                value = parser(value)
+                if value is None:
+                    raise ValueError
+            pk = int(payload['id'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
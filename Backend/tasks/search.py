@@ -0,0 +1,92 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import CharField, F, OuterRef, Q, Subquery, TextField
+from django.db.models.lookups import IContains
+
+# Configuraciones de PostgreSQL con las que se indexa y se consulta search_vector.
+SEARCH_CONFIGS = ('spanish', 'english')
+
+
+class TrigramIContains(IContains):
+    """
+    Búsqueda por subcadena que PostgreSQL resuelve con los índices GIN gin_trgm_ops.
+
+    icontains genera ``UPPER(col::text) LIKE UPPER('%x%')``, que ningún índice sobre
+    la columna puede servir. Aquí se compara la columna tal cual con ``ILIKE``, que
+    pg_trgm sí acelera. En el resto de motores (SQLite en tests) es un icontains normal.
+    """
+    lookup_name = 'trigram_icontains'
+
+    def as_sql(self, compiler, connection):
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs_sql} ILIKE {rhs_sql}', (*lhs_params, *rhs_params)
+
+
+CharField.register_lookup(TrigramIContains)
+TextField.register_lookup(TrigramIContains)
+
+
+def full_text_search_enabled():
+    return connection.vendor == 'postgresql'
+
+
+def search_vector_expression(task_model):
+    """
+    Expresión con el tsvector de una tarea: título (A), descripción (B) y nombres
+    de categoría y etiquetas (C), en cada configuración de SEARCH_CONFIGS.
+
+    Recibe el modelo para poder usarse también con el modelo histórico en migraciones.
+    """
+    category_model = task_model._meta.get_field('category').related_model
+    through = task_model.tags.through
+    category_name = Subquery(category_model.objects.filter(pk=OuterRef('category_id')).values('name')[:1])
+    tag_names = Subquery(
+        through.objects.filter(task_id=OuterRef('pk'))
+        .values('task_id')
+        .annotate(names=StringAgg('tag__name', ' '))
+        .values('names')
+    )
+    vector = None
+    for config in SEARCH_CONFIGS:
+        for expression, weight in ((F('title'), 'A'), (F('description'), 'B'), (category_name, 'C'), (tag_names, 'C')):
+            part = SearchVector(expression, config=config, weight=weight)
+            vector = part if vector is None else vector + part
+    return vector
+
+
+def refresh_search_vectors(tasks):
+    """Recalcula search_vector de las tareas del queryset con un único UPDATE."""
+    if not full_text_search_enabled():
+        return
+    tasks.update(search_vector=search_vector_expression(tasks.model))
+
+
+def search_tasks(queryset, text):
+    """
+    Filtra ``queryset`` por ``text`` y lo ordena por relevancia.
+
+    En PostgreSQL usa search_vector (índice GIN) y SearchRank. En otros motores
+    hace una búsqueda por subcadena sin ranking, ordenada por fecha de modificación.
+    """
+    if not full_text_search_enabled():
+        return queryset.filter(
+            Q(title__icontains=text)
+            | Q(description__icontains=text)
+            | Q(category__name__icontains=text)
+            | Q(tags__name__icontains=text)
+        ).distinct().order_by('-updated_at', '-id')
+
+    query = None
+    for config in SEARCH_CONFIGS:
+        part = SearchQuery(text, config=config, search_type='websearch')
+        query = part if query is None else query | part
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', '-id')
+    )
@@ -1,8 +1,14 @@
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
-from .models import Task, Category, Tag, UserProfile 
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from .models import Task, Category, Tag, UserProfile, AccountDeletion
 from django.utils import timezone
+from django.core.exceptions import ValidationError as DjangoValidationError
+from collections.abc import Mapping
+from .bulk import bulk_create_tasks, resolve_tag_names
 
 User = get_user_model()
 
@@ -12,16 +18,46 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'profile_picture')
         read_only_fields = ('id',)
 
+# Nombre de la restricción violada (o parte del mensaje de SQLite) -> campo y mensaje
+DUPLICATE_USER_ERRORS = (
+    ('auth_user_email_ci_uniq', 'email', 'Este correo electrónico ya está registrado'),
+    ('username', 'username', 'Este nombre de usuario ya existe'),
+)
+DUPLICATE_EMAIL_MESSAGE = DUPLICATE_USER_ERRORS[0][2]
+
+
+def duplicate_user_error(exc):
+    """Errores por campo para la IntegrityError de un username o email repetido; relanza las demás."""
+    diag = getattr(exc.__cause__, 'diag', None)
+    constraint = getattr(diag, 'constraint_name', None) or str(exc)
+    for marker, field, message in DUPLICATE_USER_ERRORS:
+        if marker in constraint:
+            return {field: [message]}
+    raise exc
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
+    """
+    Alta de usuario con un solo INSERT: la unicidad del nombre de usuario y del
+    correo (índice único sin distinguir mayúsculas, migración 0016) la comprueba
+    la base de datos, y la IntegrityError se traduce al error del campo.
+    """
     password = serializers.CharField(write_only=True)
 
     class Meta:
         model = User
         fields = ('username', 'email', 'password')
+        # Sin el UniqueValidator que DRF añade a username: sería otra consulta y no evita la carrera
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
 
     def create(self, validated_data):
         validated_data['password'] = make_password(validated_data['password'])
-        return super(UserRegistrationSerializer, self).create(validated_data)
+        try:
+            # La señal post_save crea el UserProfile dentro de esta misma transacción
+            with transaction.atomic():
+                return super(UserRegistrationSerializer, self).create(validated_data)
+        except IntegrityError as exc:
+            raise serializers.ValidationError(duplicate_user_error(exc))
 
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
@@ -35,10 +71,35 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'profile')
 
+    def validate_email(self, value):
+        # Misma regla que el índice auth_user_email_ci_uniq: sin distinguir mayúsculas, vacíos aparte
+        others = User.objects.filter(email__iexact=value)
+        if self.instance is not None:
+            others = others.exclude(pk=self.instance.pk)
+        if value and others.exists():
+            raise serializers.ValidationError(DUPLICATE_EMAIL_MESSAGE)
+        return value
+
+    def update(self, instance, validated_data):
+        try:
+            # Un alta concurrente con el mismo correo puede colarse entre la validación y el UPDATE
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as exc:
+            raise serializers.ValidationError(duplicate_user_error(exc))
+
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(required=True)
     new_password = serializers.CharField(required=True)
 
+class AccountDeletionSerializer(serializers.ModelSerializer):
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = AccountDeletion
+        fields = ('id', 'status', 'total_tasks', 'deleted_tasks', 'progress', 'requested_at', 'finished_at')
+        read_only_fields = fields
+
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
@@ -49,17 +110,178 @@ class TagSerializer(serializers.ModelSerializer):
         model = Tag
         fields = ['id', 'name']
 
-class TaskSerializer(serializers.ModelSerializer):
+class SparseFieldsetsMixin:
+    """
+    Proyección de campos elegida por el cliente: ?fields=id,title y/o ?omit=description.
+
+    Solo se aplica en lecturas; las escrituras validan y devuelven todos los campos.
+    Los nombres desconocidos se ignoran.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.requested_fields(self.context.get('request'))
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, request):
+        """Nombres de los campos pedidos, o None si se quieren todos."""
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return None
+        params = getattr(request, 'query_params', request.GET)
+        fields = params.get(cls.fields_query_param)
+        omit = params.get(cls.omit_query_param)
+        if not fields and not omit:
+            return None
+        available = set(cls.Meta.fields)
+        selected = {name.strip() for name in fields.split(',')} & available if fields else available
+        if omit:
+            selected = selected - {name.strip() for name in omit.split(',')}
+        return selected
+
+class BatchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField que resuelve los ids con ``in_bulk`` en lugar de un
+    ``queryset.get()`` por valor. Con ``many=True`` todos los ids de la lista se
+    resuelven en una sola consulta IN y los inexistentes se informan juntos
+    (ver BatchedManyRelatedField).
+
+    Si ``context['preloaded'][modelo]`` existe (un diccionario pk -> objeto que
+    TaskListSerializer carga una vez para todo el lote) no se consulta nada.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
+
+    def to_pk(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            return self.get_queryset().model._meta.pk.to_python(data)
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+    def resolve(self, pks):
+        """Diccionario pk -> objeto para ``pks``, de la precarga o de una sola consulta."""
+        queryset = self.get_queryset()
+        preloaded = self.context.get('preloaded', {}).get(queryset.model)
+        if preloaded is not None:
+            return preloaded
+        return queryset.in_bulk(set(pks))
+
+    def to_internal_value(self, data):
+        pk = self.to_pk(data)
+        obj = self.resolve([pk]).get(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+    default_error_messages = {
+        'does_not_exist': 'Clave primaria inválida: no existen los objetos {pk_values}.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        data = list(data)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        if not data:
+            return []
+        pks = [self.child_relation.to_pk(item) for item in data]
+        objects = self.child_relation.resolve(pks)
+        missing = [str(item) for item, pk in zip(data, pks) if pk not in objects]
+        if missing:
+            self.fail('does_not_exist', pk_values=', '.join(missing))
+        return [objects[pk] for pk in pks]
+
+class TaskListSerializer(serializers.ListSerializer):
+    """
+    Alta masiva de tareas: valida el lote completo con una consulta por modelo
+    relacionado y lo inserta con bulk_create (ver tasks.bulk.bulk_create_tasks).
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self._context['preloaded'] = self.preload_related(data)
+        return super().to_internal_value(data)
+
+    def preload_related(self, data):
+        category_ids, tag_ids = set(), set()
+        for item in data:
+            if not isinstance(item, Mapping):
+                continue
+            # Solo escalares: listas u objetos no son hashables; la validación del campo los rechaza
+            category = item.get('category')
+            if isinstance(category, (str, int)):
+                category_ids.add(category)
+            tags = item.get('tags')
+            if isinstance(tags, list):
+                tag_ids.update(tag for tag in tags if isinstance(tag, (str, int)))
+        return {
+            Category: Category.objects.in_bulk(valid_pks(Category, category_ids)),
+            Tag: Tag.objects.in_bulk(valid_pks(Tag, tag_ids)),
+        }
+
+    def create(self, validated_data):
+        return bulk_create_tasks(validated_data)
+
+def valid_pks(model, values):
+    """Los valores de ``values`` que son claves primarias válidas para ``model``."""
+    pks = set()
+    for value in values:
+        if value is None or isinstance(value, bool):
+            continue
+        try:
+            pks.add(model._meta.pk.to_python(value))
+        except DjangoValidationError:
+            pass
+    return pks
+
+class TaskSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True, allow_null=True)
     tags_names = serializers.SerializerMethodField()
-    user = serializers.ReadOnlyField(source='user.id')
-    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), allow_null=True, required=False, write_only=True)
-    tags = serializers.PrimaryKeyRelatedField(queryset=Tag.objects.all(), many=True, required=False, write_only=True)
+    user = serializers.ReadOnlyField(source='user_id')
+    category = BatchedPrimaryKeyRelatedField(queryset=Category.objects.all(), allow_null=True, required=False, write_only=True)
+    tags = BatchedPrimaryKeyRelatedField(queryset=Tag.objects.all(), many=True, required=False, write_only=True)
+    # Etiquetas por nombre; las que no existen se crean (ver Tag.objects.upsert).
+    # Distinto de tags_names, que es el campo de lectura
+    tag_names_input = serializers.ListField(child=serializers.CharField(max_length=50), required=False,
+                                            write_only=True, source='tag_names')
 
     class Meta:
         model = Task
-        fields = ['id', 'user', 'title', 'description', 'due_date', 'priority', 'status', 'category', 'category_name', 'tags', 'tags_names', 'created_at', 'updated_at']
-        read_only_fields = ('id', 'user', 'created_at', 'updated_at')
+        fields = ['id', 'user', 'title', 'description', 'due_date', 'priority', 'status', 'category', 'category_name', 'tags', 'tag_names_input', 'tags_names', 'created_at', 'updated_at', 'version']
+        read_only_fields = ('id', 'user', 'created_at', 'updated_at', 'version')
+        list_serializer_class = TaskListSerializer
+
+    # Columnas de Task que necesita cada campo de lectura (ver TaskViewSet.get_queryset).
+    # tags_names no tiene columna: se resuelve con prefetch_related('tags').
+    field_columns = {
+        'id': ('id',),
+        'user': ('user',),
+        'title': ('title',),
+        'description': ('description',),
+        'due_date': ('due_date',),
+        'priority': ('priority',),
+        'status': ('status',),
+        'category_name': ('category', 'category__name'),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+        'version': ('version',),
+    }
 
     def validate_due_date(self, value):
         if value and value < timezone.now().date():
@@ -70,16 +292,124 @@ class TaskSerializer(serializers.ModelSerializer):
         return [tag.name for tag in instance.tags.all()]
 
     def create(self, validated_data):
+        resolve_tag_names([validated_data])
         tags_data = validated_data.pop('tags', [])
         task = Task.objects.create(**validated_data)
         task.tags.set(tags_data)
         return task
 
     def update(self, instance, validated_data):
+        resolve_tag_names([validated_data])
         tags_data = validated_data.pop('tags', None)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
         if tags_data is not None:
             instance.tags.set(tags_data)
-        return instance
\ No newline at end of file
+        return instance
+
+class TaskBulkUpdateListSerializer(TaskListSerializer):
+    default_error_messages = {
+        'duplicate_id': 'La tarea {pk} aparece más de una vez.',
+    }
+
+    def validate(self, attrs):
+        seen = set()
+        for item in attrs:
+            if item['id'] in seen:
+                self.fail('duplicate_id', pk=item['id'])
+            seen.add(item['id'])
+        return attrs
+
+    def create(self, validated_data):
+        # Heredaría el alta masiva de TaskListSerializer; estos elementos solo editan tareas existentes
+        raise exceptions.MethodNotAllowed('POST', detail='La edición masiva no crea tareas; usa PATCH.')
+
+class TaskBulkUpdateSerializer(serializers.ModelSerializer):
+    """Un elemento de PATCH /api/tasks/bulk/: el id de la tarea y los campos a cambiar."""
+    id = serializers.IntegerField()
+    category = BatchedPrimaryKeyRelatedField(queryset=Category.objects.all(), allow_null=True, required=False)
+    tags = BatchedPrimaryKeyRelatedField(queryset=Tag.objects.all(), many=True, required=False)
+    tag_names_input = serializers.ListField(child=serializers.CharField(max_length=50), required=False,
+                                            source='tag_names')
+
+    validate_due_date = TaskSerializer.validate_due_date
+
+    class Meta:
+        model = Task
+        fields = ['id', 'due_date', 'priority', 'status', 'category', 'tags', 'tag_names_input']
+        list_serializer_class = TaskBulkUpdateListSerializer
+
+    def validate(self, attrs):
+        if len(attrs) == 1:
+            raise serializers.ValidationError('No hay cambios que aplicar.')
+        return attrs
+
+class TaskValuesSerializer:
+    """
+    Ruta rápida de lectura para listados: convierte filas de ``Task.objects.values()``
+    en la misma forma JSON que TaskSerializer, sin crear una instancia de Task ni
+    recorrer el grafo de campos de DRF por cada fila.
+
+    Cualquier campo de lectura nuevo en TaskSerializer debe añadirse aquí también
+    (lo comprueba TaskValuesSerializerTests).
+    """
+    # campo de TaskSerializer -> clave en values()
+    value_columns = {
+        'id': 'id',
+        'user': 'user_id',
+        'title': 'title',
+        'description': 'description',
+        'due_date': 'due_date',
+        'priority': 'priority',
+        'status': 'status',
+        'category_name': 'category__name',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+        'version': 'version',
+    }
+
+    def __init__(self, fields=None):
+        readable = [name for name in TaskSerializer.Meta.fields if name in self.value_columns or name == 'tags_names']
+        self.fields = [name for name in readable if fields is None or name in fields]
+        self.include_tags = 'tags_names' in self.fields
+        # Se reutilizan los campos de DRF para que fechas y zonas horarias salgan idénticas
+        self.formatters = {
+            'due_date': serializers.DateField().to_representation,
+            'created_at': serializers.DateTimeField().to_representation,
+            'updated_at': serializers.DateTimeField().to_representation,
+        }
+
+    def get_columns(self, *extra):
+        """Claves para ``values()``: las de los campos pedidos, el id y ``extra``."""
+        columns = {'id', *extra}
+        columns.update(self.value_columns[name] for name in self.fields if name in self.value_columns)
+        return list(columns)
+
+    def get_tag_names(self, task_ids):
+        tag_names = {task_id: [] for task_id in task_ids}
+        rows = Task.tags.through.objects.filter(task_id__in=task_ids).values_list('task_id', 'tag__name')
+        for task_id, name in rows:
+            tag_names[task_id].append(name)
+        return tag_names
+
+    def serialize(self, rows):
+        rows = list(rows)
+        tag_names = self.get_tag_names([row['id'] for row in rows]) if self.include_tags and rows else {}
+        formatters = self.formatters
+        plan = [
+            (name, self.value_columns.get(name), formatters.get(name))
+            for name in self.fields
+        ]
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, formatter in plan:
+                if column is None:
+                    item[name] = tag_names[row['id']]
+                elif formatter is None:
+                    item[name] = row[column]
+                else:
+                    item[name] = formatter(row[column])
+            data.append(item)
+        return data
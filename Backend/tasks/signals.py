@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, m2m_changed, pre_delete, post_delete
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from .models import UserProfile
+from .models import UserProfile, Task, Category, Tag, TaskCollectionVersion
+from .search import full_text_search_enabled, refresh_search_vectors
+from .authentication import user_cache
 import logging
 logger = logging.getLogger(__name__)
 
@@ -16,3 +18,101 @@ def create_user_profile(sender, instance, created, **kwargs):
             logger.info(f"UserProfile creado para el usuario: {instance.username}")
         except Exception as e:
             logger.error(f"Error al crear UserProfile: {e}")
+
+# --- Mantenimiento de Task.search_vector (solo PostgreSQL) ---
+
+@receiver(post_save, sender=Task)
+def refresh_task_search_vector(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_search_vectors(Task.objects.filter(pk=instance.pk))
+
+@receiver(m2m_changed, sender=Task.tags.through)
+def refresh_search_vector_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not full_text_search_enabled():
+        return
+    if action == 'pre_clear' and reverse:
+        # Tag.tasks.clear(): después ya no se sabe qué tareas tenían la etiqueta
+        instance._search_task_ids = list(instance.tasks.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            task_ids = [instance.pk]
+        elif action == 'post_clear':
+            task_ids = getattr(instance, '_search_task_ids', [])
+        else:
+            task_ids = pk_set or []
+        refresh_search_vectors(Task.objects.filter(pk__in=task_ids))
+
+@receiver(post_save, sender=Category)
+def refresh_search_vector_on_category_save(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_search_vectors(Task.objects.filter(category=instance))
+
+@receiver(post_save, sender=Tag)
+def refresh_search_vector_on_tag_save(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_search_vectors(Task.objects.filter(tags=instance))
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Tag)
+def remember_tasks_for_search_vector(sender, instance, **kwargs):
+    # Category usa SET_NULL y Tag borra sus filas de la tabla intermedia sin emitir señales
+    if full_text_search_enabled():
+        instance._search_task_ids = list(instance.tasks.values_list('pk', flat=True))
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def refresh_search_vector_on_delete(sender, instance, **kwargs):
+    task_ids = getattr(instance, '_search_task_ids', None)
+    if task_ids:
+        refresh_search_vectors(Task.objects.filter(pk__in=task_ids))
+
+# --- Versión de la colección de tareas de cada usuario (ETag / Last-Modified) ---
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def bump_collection_version_on_task_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        TaskCollectionVersion.objects.bump([instance.user_id])
+
+@receiver(m2m_changed, sender=Task.tags.through)
+def bump_collection_version_on_tags_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._task_user_ids = list(instance.tasks.values_list('user_id', flat=True).distinct())
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            user_ids = [instance.user_id]
+        elif action == 'post_clear':
+            user_ids = getattr(instance, '_task_user_ids', [])
+        else:
+            user_ids = Task.objects.filter(pk__in=pk_set or []).values('user_id')
+        TaskCollectionVersion.objects.bump(user_ids)
+
+@receiver(post_save, sender=Category)
+def bump_collection_version_on_category_save(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        TaskCollectionVersion.objects.bump(Task.objects.filter(category=instance).values('user_id'))
+
+@receiver(post_save, sender=Tag)
+def bump_collection_version_on_tag_save(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        TaskCollectionVersion.objects.bump(Task.objects.filter(tags=instance).values('user_id'))
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Tag)
+def remember_task_users(sender, instance, **kwargs):
+    instance._task_user_ids = list(instance.tasks.values_list('user_id', flat=True).distinct())
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def bump_collection_version_on_delete(sender, instance, **kwargs):
+    user_ids = getattr(instance, '_task_user_ids', None)
+    if user_ids:
+        TaskCollectionVersion.objects.bump(user_ids)
+
+
+# --- Invalidación de la caché de usuarios de CachedJWTAuthentication ---
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
@@ -0,0 +1,106 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from unittest import mock
+
+from tasks.accounts import process_account_deletion, request_account_deletion
+from tasks.models import AccountDeletion, Tag, Task, TaskCollectionVersion
+
+User = get_user_model()
+
+
+class AccountDeletionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.other = User.objects.create_user(username='other', password='password')
+        tag = Tag.objects.create(name='Urgente')
+        for i in range(5):
+            Task.objects.create(user=self.user, title=f'Task {i}').tags.add(tag)
+        Task.objects.create(user=self.other, title='Ajena').tags.add(tag)
+        TaskCollectionVersion.objects.current(self.user.pk)
+
+    def test_delete_profile_deactivates_and_queues(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.delete(reverse('profile'))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertEqual(response.data['total_tasks'], 5)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 5)
+
+    def test_chunks_report_progress(self):
+        deletion = request_account_deletion(self.user)
+        seen = []
+        process_account_deletion(deletion.pk, chunk_size=2, on_progress=lambda d: seen.append((d.deleted_tasks, d.status)))
+        self.assertEqual(seen, [(2, 'running'), (4, 'running'), (5, 'running'), (5, 'done')])
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(TaskCollectionVersion.objects.filter(user_id=self.user.pk).exists())
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(Task.tags.through.objects.count(), 1)
+        deletion.refresh_from_db()
+        self.assertEqual(deletion.progress, 1.0)
+        self.assertIsNotNone(deletion.finished_at)
+
+    def test_resumes_after_crash(self):
+        deletion = request_account_deletion(self.user)
+        with mock.patch('tasks.accounts.get_user_model', side_effect=RuntimeError('caída')):
+            with self.assertRaises(RuntimeError):
+                process_account_deletion(deletion.pk, chunk_size=2)
+        deletion.refresh_from_db()
+        # Los bloques confirmados se conservan y el último se ha deshecho entero
+        self.assertEqual((deletion.status, deletion.deleted_tasks), ('running', 5))
+        self.assertEqual(Task.objects.filter(user_id=self.user.pk).count(), 0)
+        out = io.StringIO()
+        call_command('process_account_deletions', once=True, stdout=out)
+        self.assertIn('Cuenta testuser borrada.', out.getvalue())
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+
+    def test_worker_sleeps_when_pending_deletions_are_locked(self):
+        request_account_deletion(self.user)
+        # Otro worker tiene la fila bloqueada: process_account_deletion devuelve None
+        with mock.patch('tasks.management.commands.process_account_deletions.process_account_deletion',
+                        return_value=None), \
+                mock.patch('tasks.management.commands.process_account_deletions.time.sleep',
+                           side_effect=KeyboardInterrupt) as sleep:
+            with self.assertRaises(KeyboardInterrupt):
+                call_command('process_account_deletions', sleep=3, stdout=io.StringIO())
+        sleep.assert_called_once_with(3)
+
+
+class UserAdminDeletionTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='password')
+        self.client.force_login(self.admin)
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        for i in range(3):
+            Task.objects.create(user=self.user, title=f'Task {i}')
+
+    def assertQueued(self, user):
+        user.refresh_from_db()
+        self.assertFalse(user.is_active)
+        self.assertEqual(AccountDeletion.objects.get(user_id=user.pk).total_tasks, Task.objects.filter(user=user).count())
+
+    def test_delete_view_queues_the_deletion(self):
+        url = reverse('admin:auth_user_delete', args=[self.user.pk])
+        response = self.client.get(url)
+        self.assertContains(response, 'sus 3 tareas se borran en segundo plano')
+        response = self.client.post(url, {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertQueued(self.user)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
+
+    def test_delete_action_queues_each_user(self):
+        other = User.objects.create_user(username='other', password='password')
+        response = self.client.post(reverse('admin:auth_user_changelist'), {
+            'action': 'delete_selected', 'post': 'yes', '_selected_action': [self.user.pk, other.pk],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertQueued(self.user)
+        self.assertQueued(other)
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tasks.accounts import process_account_deletion, request_account_deletion
+from tasks.authentication import user_cache
+from tasks.models import Task
+
+User = get_user_model()
+
+
+def user_queries(queries):
+    return [q for q in queries if 'FROM "auth_user"' in q['sql']]
+
+
+class JWTAuthenticationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword', first_name='Ana')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        Task.objects.create(user=self.user, title='Task 1')
+
+    def test_task_reads_do_not_load_the_user(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(user_queries(queries), [])
+
+    def test_task_writes_load_the_user_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            created = self.client.post('/api/tasks/', {'title': 'Nueva'}, format='json')
+            self.client.post('/api/tasks/', {'title': 'Otra'}, format='json')
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(created.data['user'], self.user.pk)
+        self.assertEqual(len(user_queries(queries)), 1)
+
+    def test_task_writes_are_rejected_for_deleted_accounts(self):
+        deletion = request_account_deletion(self.user)
+        response = self.client.post('/api/tasks/', {'title': 'Nueva'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        process_account_deletion(deletion.pk)
+        response = self.client.post('/api/tasks/', {'title': 'Nueva'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(Task.objects.exists())
+
+    def test_full_user_is_cached_until_saved(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/profile/')
+            response = self.client.get('/api/profile/')
+        self.assertEqual(response.data['first_name'], 'Ana')
+        self.assertEqual(len(user_queries(queries)), 1)
+
+        self.user.first_name = 'Eva'
+        self.user.save()
+        self.assertEqual(self.client.get('/api/profile/').data['first_name'], 'Eva')
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/api/profile/')
+        request_account_deletion(self.user)
+        response = self.client.get('/api/profile/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_user_is_a_copy(self):
+        self.client.get('/api/profile/')
+        cached = user_cache.get(self.user.pk)
+        cached.first_name = 'Cambiado'
+        self.assertEqual(user_cache.get(self.user.pk).first_name, 'Ana')
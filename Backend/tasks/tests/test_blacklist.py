@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tasks.blacklist import BlacklistableRefreshToken, BloomFilter, token_blacklist
+from tasks.models import BlacklistedToken
+
+User = get_user_model()
+
+
+class BloomFilterTests(TestCase):
+    def test_added_keys_are_always_found(self):
+        bloom = BloomFilter(1000, 0.01)
+        keys = [f'jti-{i}' for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+@override_settings(BLACKLIST_SYNC_INTERVAL=3600)
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        token_blacklist.reset()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+
+    def test_unknown_token_is_checked_without_queries(self):
+        token_blacklist.contains('warm-up')
+        token = BlacklistableRefreshToken.for_user(self.user)
+        with self.assertNumQueries(0):
+            BlacklistableRefreshToken(str(token))
+
+    def test_blacklisted_token_is_rejected(self):
+        token = BlacklistableRefreshToken.for_user(self.user)
+        BlacklistableRefreshToken(str(token)).blacklist()
+        with self.assertRaises(TokenError):
+            BlacklistableRefreshToken(str(token))
+
+    def test_rows_from_other_processes_are_synced(self):
+        token_blacklist.contains('warm-up')
+        token = BlacklistableRefreshToken.for_user(self.user)
+        BlacklistedToken.objects.create(jti=token['jti'], expires_at=timezone.now() + timedelta(days=1))
+        with override_settings(BLACKLIST_SYNC_INTERVAL=0):
+            self.assertTrue(token_blacklist.contains(token['jti']))
+
+    def test_prune_deletes_expired_entries(self):
+        now = timezone.now()
+        BlacklistedToken.objects.create(jti='expired', expires_at=now - timedelta(minutes=1))
+        BlacklistedToken.objects.create(jti='live', expires_at=now + timedelta(days=1))
+        self.assertEqual(token_blacklist.prune(), 1)
+        self.assertEqual(list(BlacklistedToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertFalse(token_blacklist.contains('expired'))
+        self.assertTrue(token_blacklist.contains('live'))
+
+    @override_settings(BLACKLIST_FILTER_CAPACITY=4)
+    def test_filter_grows_beyond_capacity_without_rebuilding(self):
+        expires_at = timezone.now() + timedelta(days=1)
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(jti=f'jti-{i}', expires_at=expires_at) for i in range(10)])
+        token_blacklist.contains('warm-up')
+        self.assertGreaterEqual(token_blacklist.filter.capacity, 20)
+        with self.assertNumQueries(0):
+            token_blacklist.contains('unknown')
+
+    def test_checks_prune_expired_entries_periodically(self):
+        BlacklistedToken.objects.create(jti='expired', expires_at=timezone.now() - timedelta(minutes=1))
+        token_blacklist.contains('warm-up')
+        self.assertTrue(BlacklistedToken.objects.filter(jti='expired').exists())
+        with override_settings(BLACKLIST_PRUNE_INTERVAL=0):
+            token_blacklist.contains('warm-up')
+        self.assertFalse(BlacklistedToken.objects.filter(jti='expired').exists())
+
+    @override_settings(BLACKLIST_PRUNE_INTERVAL=0)
+    def test_add_prunes_expired_entries(self):
+        BlacklistedToken.objects.create(jti='expired', expires_at=timezone.now() - timedelta(minutes=1))
+        token_blacklist.add('new', timezone.now() + timedelta(days=1))
+        self.assertFalse(BlacklistedToken.objects.filter(jti='expired').exists())
+
+
+class TokenRefreshViewTests(TestCase):
+    def setUp(self):
+        token_blacklist.reset()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        refresh = RefreshToken.for_user(self.user)
+        self.refresh_token = str(refresh)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_refresh_returns_access_token(self):
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.refresh_token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+
+    def test_refresh_after_logout_is_rejected(self):
+        response = self.client.post(reverse('logout'), {'refresh_token': self.refresh_token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT)
+        response = self.client.post(reverse('token_refresh'), {'refresh': self.refresh_token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('logout'), {'refresh_token': self.refresh_token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_verify_after_logout_is_rejected(self):
+        response = self.client.post(reverse('token_verify'), {'token': self.refresh_token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.post(reverse('logout'), {'refresh_token': self.refresh_token}, format='json')
+        response = self.client.post(reverse('token_verify'), {'token': self.refresh_token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, SimpleTestCase, TransactionTestCase
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tasks.authentication import user_cache
+from tasks.hashing import HashingPoolBusy, PasswordHashingPool, password_hashing
+from tasks.views import AsyncChangePasswordView, AsyncLoginView, AsyncResetPasswordView
+
+User = get_user_model()
+
+
+class PasswordHashingPoolTests(SimpleTestCase):
+    async def test_runs_outside_the_event_loop_thread(self):
+        pool = PasswordHashingPool(max_workers=1, max_pending=4)
+        self.assertNotEqual(await pool.run(threading.get_ident), threading.get_ident())
+        self.assertEqual(pool.pending, 0)
+
+    async def test_rejects_work_when_full(self):
+        pool = PasswordHashingPool(max_workers=1, max_pending=1)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+            return 'ok'
+
+        task = asyncio.ensure_future(pool.run(block))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        with self.assertRaises(HashingPoolBusy):
+            await pool.run(int)
+        release.set()
+        self.assertEqual(await task, 'ok')
+        self.assertEqual(await pool.run(int, '7'), 7)
+
+    async def test_exceptions_are_propagated(self):
+        pool = PasswordHashingPool(max_workers=1, max_pending=1)
+        with self.assertRaises(ValueError):
+            await pool.run(int, 'x')
+        self.assertEqual(pool.pending, 0)
+
+
+class AsyncAuthViewTests(TransactionTestCase):
+    # El pool usa sus propias conexiones: necesita datos confirmados
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.factory = AsyncRequestFactory()
+        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpassword')
+
+    def post(self, view_class, path, data, method='post', **extra):
+        request = getattr(self.factory, method)(path, json.dumps(data), content_type='application/json', **extra)
+        # Lo que pondría SessionMiddleware (update_session_auth_hash lo usa)
+        request.session = SessionStore()
+        response = async_to_sync(view_class.as_view())(request)
+        response.render()
+        return response
+
+    def test_login(self):
+        response = self.post(AsyncLoginView, '/api/login/', {'username': 'testuser', 'password': 'testpassword'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        response = self.post(AsyncLoginView, '/api/login/', {'username': 'testuser', 'password': 'wrong'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_change_password(self):
+        token = RefreshToken.for_user(self.user).access_token
+        response = self.post(AsyncChangePasswordView, '/api/profile/change-password/',
+                             {'old_password': 'testpassword', 'new_password': 'newpassword'},
+                             method='put', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('newpassword'))
+
+    def test_reset_password(self):
+        data = {
+            'uidb64': urlsafe_base64_encode(force_bytes(self.user.pk)),
+            'token': default_token_generator.make_token(self.user),
+            'new_password': 'newpassword',
+            'confirm_password': 'newpassword',
+        }
+        response = self.post(AsyncResetPasswordView, '/api/reset-password/', data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('newpassword'))
+
+    def test_full_pool_answers_503(self):
+        with mock.patch.object(password_hashing, 'acquire', return_value=False):
+            response = self.post(AsyncLoginView, '/api/login/', {'username': 'testuser', 'password': 'testpassword'})
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from tasks.imports import TaskImporter, detect_format
+from tasks.models import Task, Category, Tag
+
+User = get_user_model()
+
+CSV_DATA = (
+    'title,description,due_date,priority,status,category,tags\n'
+    'Pagar facturas,,2020-01-31,high,completed,Casa,Urgente|Dinero\n'
+    ',Sin título,,,,,\n'
+    'Revisar informe,Anual,,,in_progress,Trabajo,Urgente\n'
+    'Llamar a Ana,,no-es-fecha,,,,\n'
+)
+
+
+class TaskImporterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        Tag.objects.create(name='Urgente')
+
+    def test_csv_import(self):
+        errors = []
+        report = TaskImporter(self.user, on_error=lambda line, e: errors.append(line)).run(
+            io.BytesIO(CSV_DATA.encode()), 'csv')
+        self.assertEqual((report.rows_read, report.rows_imported, report.rows_failed), (4, 2, 2))
+        self.assertEqual(errors, [3, 5])
+        self.assertIn('title', report.errors[0]['errors'])
+        self.assertIn('due_date', report.errors[1]['errors'])
+        bills = Task.objects.get(user=self.user, title='Pagar facturas')
+        self.assertEqual(str(bills.due_date), '2020-01-31')
+        self.assertEqual(bills.category.name, 'Casa')
+        self.assertEqual(sorted(bills.tags.values_list('name', flat=True)), ['Dinero', 'Urgente'])
+        self.assertIsNone(bills.description)
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_jsonl_import_in_batches(self):
+        lines = [json.dumps({'title': f'Task {i}', 'category': f'Cat {i % 2}', 'tags': ['Urgente']}) for i in range(7)]
+        lines.insert(3, '{no es json')
+        batches = []
+        report = TaskImporter(self.user, batch_size=3, on_batch=lambda r: batches.append(r.rows_read)).run(
+            io.BytesIO('\n'.join(lines).encode()), 'jsonl')
+        self.assertEqual(batches, [3, 6, 8])
+        self.assertEqual(report.rows_imported, 7)
+        self.assertEqual(report.errors[0]['line'], 4)
+        self.assertEqual(Category.objects.count(), 2)
+        self.assertEqual(Task.tags.through.objects.count(), 7)
+
+    def test_malformed_csv_stops_the_import(self):
+        # Un campo mayor que csv.field_size_limit() hace fallar al lector
+        content = f'title,description\nPrimera,ok\nSegunda,{"x" * (csv.field_size_limit() + 1)}\nTercera,ok\n'
+        report = TaskImporter(self.user).run(io.BytesIO(content.encode()), 'csv')
+        self.assertEqual(report.rows_imported, 1)
+        self.assertEqual(report.file_error['line'], 3)
+        self.assertIn('CSV inválido', report.as_dict()['file_error']['error'])
+        self.assertEqual(Task.objects.get(user=self.user).title, 'Primera')
+
+    def test_undecodable_jsonl_keeps_previous_batches(self):
+        content = b'{"title": "A"}\n{"title": "B"}\n{"title": "\xe9"}\n'
+        report = TaskImporter(self.user, batch_size=1).run(io.BytesIO(content), 'jsonl')
+        self.assertEqual(report.rows_imported, 2)
+        self.assertEqual(report.file_error['line'], 3)
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format('tareas.CSV'), 'csv')
+        self.assertEqual(detect_format('tareas.ndjson'), 'jsonl')
+        self.assertIsNone(detect_format('tareas.xlsx'))
+
+
+class ImportTasksCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'tareas.csv')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(CSV_DATA)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_command_reports_rate_and_errors(self):
+        errors_path = os.path.join(self.directory.name, 'errores.jsonl')
+        out = io.StringIO()
+        call_command('import_tasks', self.path, user='testuser', errors=errors_path, stdout=out)
+        self.assertIn('Importadas 2 de 4 filas', out.getvalue())
+        self.assertIn('filas/s', out.getvalue())
+        with open(errors_path, encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)['line'] for line in f], [3, 5])
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 2)
+
+    def test_command_fails_on_undecodable_file(self):
+        with open(self.path, 'wb') as f:
+            f.write('title\nCafé\n'.encode('latin-1'))
+        with self.assertRaisesMessage(CommandError, 'línea 2'):
+            call_command('import_tasks', self.path, user='testuser', stdout=io.StringIO())
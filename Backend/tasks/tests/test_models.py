@@ -59,6 +59,15 @@ class TagModelTest(TestCase):
     def test_tag_str_method(self):
         self.assertEqual(str(cls.tag), 'Urgente')
 
+    def test_upsert_creates_only_missing_tags(self):
+        with self.assertNumQueries(2):
+            tags = Tag.objects.upsert(['Urgente', 'Casa', 'Casa'])
+        self.assertEqual(set(tags), {'Urgente', 'Casa'})
+        self.assertEqual(tags['Urgente'].pk, self.tag.pk)
+        self.assertEqual(Tag.objects.upsert(['Casa'])['Casa'].pk, tags['Casa'].pk)
+        self.assertEqual(Tag.objects.count(), 2)
+        self.assertEqual(Tag.objects.upsert([]), {})
+
 class UserProfileModelTest(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -0,0 +1,67 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from tasks.models import Task, Category
+from tasks.renderers import ORJSONRenderer, MessagePackRenderer, ORJSONParser, MessagePackParser
+from decimal import Decimal
+import datetime
+import io
+import json
+import msgpack
+
+User = get_user_model()
+
+class RendererTests(TestCase):
+    def setUp(self):
+        self.data = {
+            'id': 1,
+            'title': 'Tarea con ñ',
+            'due_date': datetime.date(2030, 1, 2),
+            'created_at': datetime.datetime(2030, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            'amount': Decimal('1.50'),
+            'tags_names': ['a', 'b'],
+        }
+
+    def test_orjson_output_matches_drf_json_renderer(self):
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(self.data)),
+            json.loads(JSONRenderer().render(self.data)),
+        )
+
+    def test_msgpack_round_trip_uses_drf_date_format(self):
+        rendered = MessagePackRenderer().render(self.data)
+        parsed = MessagePackParser().parse(io.BytesIO(rendered))
+        self.assertEqual(parsed, json.loads(JSONRenderer().render(self.data)))
+
+    def test_orjson_parser(self):
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(b'{"a": [1, 2]}')), {'a': [1, 2]})
+
+class ContentNegotiationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.task_list_url = reverse('task-list')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name='Trabajo')
+        Task.objects.create(user=self.user, title='Task 1', category=self.category, due_date=timezone.now().date())
+
+    def test_task_list_as_msgpack(self):
+        json_response = self.client.get(self.task_list_url)
+        msgpack_response = self.client.get(self.task_list_url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(msgpack_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(msgpack_response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(msgpack_response.content), json.loads(json_response.content))
+
+    def test_create_task_from_msgpack(self):
+        body = {'title': 'Desde el móvil', 'category': self.category.id}
+        response = self.client.post(self.task_list_url, body, format='msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.get(id=response.data['id']).title, 'Desde el móvil')
+
+    def test_invalid_json_body(self):
+        response = self.client.post(self.task_list_url, '{"title": ', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
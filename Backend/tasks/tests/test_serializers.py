@@ -3,7 +3,7 @@ from django.contrib.auth import get_user_model
 from tasks.models import Task, Category, Tag, UserProfile
 from tasks.serializers import (
     UserSerializer, UserRegistrationSerializer, UserProfileSerializer,
-    CategorySerializer, TagSerializer, TaskSerializer, ChangePasswordSerializer
+    CategorySerializer, TagSerializer, TaskSerializer, TaskValuesSerializer, ChangePasswordSerializer
 )
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
@@ -141,6 +141,65 @@ class TaskSerializerTests(TestCase):
         self.assertEqual(updated_task.tags.count(), 1)
         self.assertIn(cls.tag2, updated_task.tags.all())
 
+class BatchedPrimaryKeyRelatedFieldTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Home')
+        cls.tags = [Tag.objects.create(name=f'Tag {i}') for i in range(20)]
+
+    def test_tags_are_resolved_with_one_query(self):
+        data = {'title': 'Muchas etiquetas', 'category': self.category.id, 'tags': [tag.id for tag in self.tags]}
+        serializer = TaskSerializer(data=data)
+        with self.assertNumQueries(2):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['tags'], self.tags)
+        self.assertEqual(serializer.validated_data['category'], self.category)
+
+    def test_missing_ids_are_reported_together(self):
+        missing = [999998, 999999]
+        serializer = TaskSerializer(data={'title': 'x', 'tags': [self.tags[0].id] + missing})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['tags'][0].code, 'does_not_exist')
+        self.assertIn('999998, 999999', str(serializer.errors['tags'][0]))
+
+    def test_invalid_values(self):
+        serializer = TaskSerializer(data={'title': 'x', 'tags': [True], 'category': 999999})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['tags'][0].code, 'incorrect_type')
+        self.assertEqual(serializer.errors['category'][0].code, 'does_not_exist')
+        serializer = TaskSerializer(data={'title': 'x', 'tags': 'abc'})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['tags'][0].code, 'not_a_list')
+
+class TaskValuesSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser')
+        category = Category.objects.create(name='Home')
+        tags = [Tag.objects.create(name='Shopping'), Tag.objects.create(name='Weekend')]
+        full = Task.objects.create(
+            user=cls.user, title='Buy groceries', description='Milk', category=category,
+            due_date=timezone.now().date(), priority='high', status='in_progress',
+        )
+        full.tags.set(tags)
+        Task.objects.create(user=cls.user, title='Empty task')
+
+    def values_data(self, fields=None):
+        serializer = TaskValuesSerializer(fields)
+        rows = Task.objects.order_by('id').values(*serializer.get_columns())
+        return serializer.serialize(rows)
+
+    def test_same_representation_as_task_serializer(self):
+        tasks = Task.objects.order_by('id').prefetch_related('tags')
+        expected = TaskSerializer(tasks, many=True).data
+        self.assertEqual(self.values_data(), [dict(item) for item in expected])
+
+    def test_fields_subset(self):
+        data = self.values_data({'id', 'title', 'tags_names'})
+        self.assertEqual(list(data[0]), ['id', 'title', 'tags_names'])
+        self.assertEqual(sorted(data[0]['tags_names']), ['Shopping', 'Weekend'])
+        self.assertEqual(data[1]['tags_names'], [])
+
 class ChangePasswordSerializerTests(TestCase):
     @classmethod
     def setUpTestData(cls):
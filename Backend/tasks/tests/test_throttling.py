@@ -0,0 +1,103 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.throttling import LoginRateThrottle
+
+User = get_user_model()
+
+RATES = {
+    'login': '2/min',
+    'login_ip': '3/min',
+    'forgot_password': '2/hour',
+    'forgot_password_ip': '20/hour',
+    'reset_password': '2/hour',
+    'reset_password_ip': '20/hour',
+}
+
+
+@override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': RATES})
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.login_url = reverse('login')
+        User.objects.create_user(username='testuser', password='testpassword')
+        # Reloj fijo: un cambio de ventana a mitad de un test rebajaría los recuentos
+        timer = mock.patch.object(LoginRateThrottle, 'timer', return_value=6000.0)
+        timer.start()
+        self.addCleanup(timer.stop)
+
+    def login(self, username, password='wrong', ip='10.0.0.1'):
+        return self.client.post(self.login_url, {'username': username, 'password': password},
+                                format='json', REMOTE_ADDR=ip)
+
+    def test_rejected_login_runs_no_queries_and_no_hashing(self):
+        self.login('testuser')
+        self.login('testuser')
+        with self.assertNumQueries(0), mock.patch('tasks.views.authenticate') as authenticate:
+            response = self.login('testuser')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        authenticate.assert_not_called()
+
+    def test_account_limit_applies_across_ips(self):
+        self.login('testuser', ip='10.0.0.1')
+        self.login('TestUser', ip='10.0.0.2')
+        self.assertEqual(self.login('testuser', ip='10.0.0.3').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login('otheruser', ip='10.0.0.3').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_ip_limit_applies_across_accounts(self):
+        for username in ('a', 'b', 'c'):
+            self.assertEqual(self.login(username).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.login('d').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login('d', ip='10.0.0.9').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_previous_window_still_counts_partially(self):
+        throttle = LoginRateThrottle()
+        self.assertEqual(throttle.limits, {'ip': (3, 60), 'account': (2, 60)})
+        with mock.patch.object(LoginRateThrottle, 'timer', return_value=6000.0):
+            self.login('testuser')
+            self.login('testuser')
+            self.assertEqual(self.login('testuser').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # 10 s dentro de la ventana siguiente la anterior aún cuenta 2 * 50/60 ≈ 1.67: cabe una más
+        with mock.patch.object(LoginRateThrottle, 'timer', return_value=6070.0):
+            self.assertEqual(self.login('testuser').status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(self.login('testuser').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_successful_login_still_works_under_limit(self):
+        response = self.login('testuser', password='testpassword')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': RATES})
+class PasswordResetThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        User.objects.create_user(username='testuser', email='test@example.com', password='testpassword')
+
+    def test_forgot_password_is_throttled_by_email(self):
+        url = reverse('forgot_password')
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, {'email': 'test@example.com'}, format='json').status_code,
+                             status.HTTP_200_OK)
+        with self.assertNumQueries(0), mock.patch('tasks.views.send_mail') as send_mail:
+            response = self.client.post(url, {'email': 'TEST@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        send_mail.assert_not_called()
+
+    def test_reset_password_is_throttled_by_uid(self):
+        url = reverse('reset_password')
+        data = {'uidb64': 'MQ', 'token': 'bad', 'new_password': 'x1234567', 'confirm_password': 'x1234567'}
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, data, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        with self.assertNumQueries(0):
+            response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
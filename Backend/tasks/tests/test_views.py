@@ -1,16 +1,29 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.urls import ResolverMatch, reverse
 from rest_framework.test import APIClient
 from rest_framework import status
-from tasks.models import Task, Category, Tag
+from tasks.models import Task, Category, Tag, TaskCollectionVersion, UserProfile
+from tasks.cache import task_list_cache
+from tasks.views import TaskViewSet
+from tasks import batch, views
+import io
 import json
+import time
 from django.core import mail
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
+from django.core.management import call_command
+from django.utils.http import parse_http_date, urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import default_token_generator
 from django.conf import settings
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from datetime import date, timedelta
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
 
 User = get_user_model()
 
@@ -42,6 +55,49 @@ class UserRegistrationViewTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('email', response.data)
 
+class UserRegistrationConstraintTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.registration_url = reverse('register')
+        User.objects.create_user(username='existinguser', email='exist@example.com', password='password')
+
+    def register(self, username, email):
+        return self.client.post(self.registration_url, {'username': username, 'email': email, 'password': 'securepassword'},
+                                format='json')
+
+    def test_registration_inserts_without_lookups(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.register('newuser', 'new@example.com')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse([q for q in queries if q['sql'].startswith('SELECT')])
+        self.assertTrue(UserProfile.objects.filter(user__username='newuser').exists())
+
+    def test_duplicate_username_is_mapped_to_field(self):
+        response = self.register('existinguser', 'new@example.com')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'username': ['Este nombre de usuario ya existe']})
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_duplicate_email_ignores_case(self):
+        response = self.register('newuser', 'Exist@Example.com')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'email': ['Este correo electrónico ya está registrado']})
+        self.assertFalse(User.objects.filter(username='newuser').exists())
+        self.assertEqual(UserProfile.objects.count(), 1)
+
+    def test_profile_update_rejects_taken_email(self):
+        user = User.objects.create_user(username='otheruser', email='other@example.com', password='password')
+        self.client.force_authenticate(user=user)
+        response = self.client.patch(reverse('profile'), {'email': 'EXIST@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'email': ['Este correo electrónico ya está registrado']})
+        response = self.client.patch(reverse('profile'), {'email': 'Other@Example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_blank_emails_are_not_duplicates(self):
+        self.assertEqual(self.register('first', '').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.register('second', '').status_code, status.HTTP_201_CREATED)
+
 class LoginViewTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -171,6 +227,841 @@ class TaskViewSetTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Task.objects.count(), 1)
 
+class TaskConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.task_list_url = reverse('task-list')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.tag = Tag.objects.create(name='Urgente')
+        self.task = Task.objects.create(user=self.user, title='Task 1')
+        self.task.tags.add(self.tag)
+        self.task_detail_url = reverse('task-detail', args=[self.task.id])
+
+    def assertNotModified(self, url, **headers):
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def assertModified(self, url, **headers):
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_if_none_match_on_list_and_detail(self):
+        for url in (self.task_list_url, self.task_detail_url):
+            etag = self.assertModified(url)['ETag']
+            self.assertNotModified(url, if_none_match=etag)
+
+    def test_detail_not_modified_is_checked_before_reading_the_task(self):
+        etag = self.assertModified(self.task_detail_url)['ETag']
+        # Solo la lectura de la versión de la colección
+        with self.assertNumQueries(1):
+            self.assertNotModified(self.task_detail_url, if_none_match=etag)
+
+    def test_detail_etag_changes_with_tag_and_category_names(self):
+        category = Category.objects.create(name='Casa')
+        Task.objects.filter(pk=self.task.pk).update(category=category)
+        etag = self.assertModified(self.task_detail_url)['ETag']
+        self.tag.name = 'Renombrada'
+        self.tag.save()
+        response = self.assertModified(self.task_detail_url, if_none_match=etag)
+        self.assertEqual(response.data['tags_names'], ['Renombrada'])
+        etag = response['ETag']
+        category.name = 'Hogar'
+        category.save()
+        self.assertEqual(self.assertModified(self.task_detail_url, if_none_match=etag).data['category_name'], 'Hogar')
+
+    def test_detail_etag_depends_on_representation(self):
+        etag = self.assertModified(self.task_detail_url)['ETag']
+        self.assertModified(f'{self.task_detail_url}?fields=id', if_none_match=etag)
+        self.assertModified(self.task_detail_url, if_none_match=etag, accept='application/msgpack')
+
+    def test_if_modified_since(self):
+        changed_at = TaskCollectionVersion.objects.current(self.user.pk).changed_at
+        with mock.patch('tasks.conditional.time') as clock:
+            # Mientras dura el segundo del cambio no se anuncia Last-Modified
+            clock.time.return_value = int(changed_at.timestamp()) + 0.5
+            self.assertNotIn('Last-Modified', self.assertModified(self.task_list_url))
+        TaskCollectionVersion.objects.filter(user=self.user).update(changed_at=changed_at - timedelta(seconds=5))
+        last_modified = self.assertModified(self.task_list_url)['Last-Modified']
+        self.assertNotModified(self.task_list_url, if_modified_since=last_modified)
+        # Una escritura posterior invalida If-Modified-Since sin llevar Last-Modified al futuro
+        Task.objects.create(user=self.user, title='Task 2')
+        with mock.patch('tasks.conditional.time') as clock:
+            clock.time.return_value = time.time() + 1
+            response = self.assertModified(self.task_list_url, if_modified_since=last_modified)
+        self.assertLessEqual(parse_http_date(response['Last-Modified']), time.time())
+
+    def test_writes_change_the_etag(self):
+        writes = [
+            lambda: self.client.post(self.task_list_url, {'title': 'Nueva'}, format='json'),
+            lambda: self.client.patch(self.task_detail_url, {'status': 'completed'}, format='json'),
+            lambda: self.task.tags.remove(self.tag),
+            lambda: self.tag.tasks.add(self.task),
+            lambda: Tag.objects.filter(pk=self.tag.pk).first().save(),
+            lambda: self.tag.delete(),
+            lambda: self.client.delete(self.task_detail_url),
+        ]
+        for write in writes:
+            etag = self.assertModified(self.task_list_url)['ETag']
+            write()
+            self.assertNotEqual(self.assertModified(self.task_list_url, if_none_match=etag)['ETag'], etag)
+
+    def test_etag_depends_on_query_and_user(self):
+        etag = self.assertModified(self.task_list_url)['ETag']
+        self.assertModified(f'{self.task_list_url}?status=pending', if_none_match=etag)
+        other_user = User.objects.create_user(username='otheruser', password='testpassword')
+        self.client.force_authenticate(user=other_user)
+        self.assertModified(self.task_list_url, if_none_match=etag)
+
+    def test_other_users_writes_keep_the_etag(self):
+        etag = self.assertModified(self.task_list_url)['ETag']
+        other_user = User.objects.create_user(username='otheruser', password='testpassword')
+        Task.objects.create(user=other_user, title='Ajena')
+        self.assertNotModified(self.task_list_url, if_none_match=etag)
+
+class TaskListCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.task_list_url = reverse('task-list')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name='Trabajo')
+        self.task = Task.objects.create(user=self.user, title='Task 1', category=self.category)
+
+    def get(self, url=None):
+        response = self.client.get(url or self.task_list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_hit_after_miss_and_counters(self):
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+        self.assertEqual(self.get()['X-Cache'], 'HIT')
+        self.assertEqual(self.get(f'{self.task_list_url}?status=pending')['X-Cache'], 'MISS')
+        self.assertEqual(task_list_cache.stats(), {'hits': 1, 'misses': 2, 'hit_rate': 1 / 3})
+
+    def test_stats_command_reports_and_resets(self):
+        self.get()
+        self.get()
+        out = io.StringIO()
+        call_command('task_list_cache_stats', reset=True, stdout=out)
+        self.assertIn('Aciertos: 1, fallos: 1, tasa de aciertos: 50.0%', out.getvalue())
+        self.assertEqual(task_list_cache.stats(), {'hits': 0, 'misses': 0, 'hit_rate': None})
+
+    def test_task_write_invalidates(self):
+        self.get()
+        self.client.patch(reverse('task-detail', args=[self.task.id]), {'title': 'Cambiada'}, format='json')
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title'], 'Cambiada')
+
+    def test_category_rename_invalidates(self):
+        self.get()
+        self.client.patch(reverse('category-detail', args=[self.category.id]), {'name': 'Casa'}, format='json')
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['category_name'], 'Casa')
+
+    def test_cache_is_per_user(self):
+        self.get()
+        other_user = User.objects.create_user(username='otheruser', password='testpassword')
+        self.client.force_authenticate(user=other_user)
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'], [])
+
+class TaskSparseFieldsetsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.task_list_url = reverse('task-list')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        category = Category.objects.create(name='Trabajo')
+        tag = Tag.objects.create(name='Urgente')
+        for i in range(3):
+            task = Task.objects.create(user=self.user, title=f'Task {i}', description='x' * 1000, category=category)
+            task.tags.add(tag)
+
+    def test_fields_selects_representation_and_columns(self):
+        url = f'{self.task_list_url}?pagination=cursor&fields=id,title,status,due_date'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for task in response.data['results']:
+            self.assertEqual(set(task), {'id', 'title', 'status', 'due_date'})
+        # Sin consulta de tags ni JOIN con categorías, y sin leer description (las tareas
+        # sin due_date salen de la consulta del bloque de nulos del cursor)
+        self.assertFalse(any('tasks_task_tags' in query['sql'] for query in queries))
+        sql = [query['sql'] for query in queries if 'FROM "tasks_task"' in query['sql']]
+        self.assertTrue(sql)
+        for statement in sql:
+            self.assertNotIn('description', statement)
+            self.assertNotIn('tasks_category', statement)
+
+    def test_omit_drops_fields(self):
+        response = self.client.get(f'{self.task_list_url}?omit=description,tags_names')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        task = response.data['results'][0]
+        self.assertNotIn('description', task)
+        self.assertNotIn('tags_names', task)
+        self.assertEqual(task['category_name'], 'Trabajo')
+
+    def test_fields_on_detail_with_tags(self):
+        task = Task.objects.filter(user=self.user).first()
+        response = self.client.get(reverse('task-detail', args=[task.id]), {'fields': 'id,tags_names,unknown'})
+        self.assertEqual(response.data, {'id': task.id, 'tags_names': ['Urgente']})
+
+    def test_writes_ignore_projection(self):
+        task = Task.objects.filter(user=self.user).first()
+        response = self.client.patch(f"{reverse('task-detail', args=[task.id])}?fields=id", {'title': 'Nueva'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Nueva')
+        self.assertIn('description', response.data)
+
+class TaskSubstringFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.task_list_url = reverse('task-list')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.report = Task.objects.create(user=self.user, title='Revisar Informe anual', description='Enviar al 100% del equipo')
+        self.other = Task.objects.create(user=self.user, title='Comprar pan', description='Panadería de la esquina')
+
+    def filtered_ids(self, **params):
+        response = self.client.get(self.task_list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {task['id'] for task in response.data['results']}
+
+    def test_title_filter_is_case_insensitive_substring(self):
+        self.assertEqual(self.filtered_ids(title='informe'), {self.report.id})
+        self.assertEqual(self.filtered_ids(title='PAN'), {self.other.id})
+
+    def test_description_filter_escapes_wildcards(self):
+        self.assertEqual(self.filtered_ids(description='100%'), {self.report.id})
+        self.assertEqual(self.filtered_ids(description='%'), {self.report.id})
+        self.assertEqual(self.filtered_ids(description='_'), set())
+
+class TaskSearchViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.search_url = reverse('task-search')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        work = Category.objects.create(name='Trabajo')
+        urgent = Tag.objects.create(name='Urgente')
+        self.by_title = Task.objects.create(user=self.user, title='Preparar presupuesto')
+        self.by_category = Task.objects.create(user=self.user, title='Llamar a Ana', category=work)
+        self.by_tag = Task.objects.create(user=self.user, title='Pagar factura')
+        self.by_tag.tags.add(urgent)
+        other_user = User.objects.create_user(username='otheruser', password='testpassword')
+        Task.objects.create(user=other_user, title='Presupuesto ajeno')
+
+    def search_ids(self, **params):
+        response = self.client.get(self.search_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task['id'] for task in response.data['results']]
+
+    def test_search_matches_title_category_and_tags(self):
+        self.assertEqual(self.search_ids(q='presupuesto'), [self.by_title.id])
+        self.assertEqual(self.search_ids(q='trabajo'), [self.by_category.id])
+        self.assertEqual(self.search_ids(q='urgente'), [self.by_tag.id])
+
+    def test_search_combines_with_task_filters(self):
+        self.assertEqual(self.search_ids(q='presupuesto', status='completed'), [])
+
+    def test_search_requires_query(self):
+        response = self.client.get(self.search_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+class TaskKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.task_list_url = reverse('task-list')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        today = date.today()
+        for i in range(25):
+            Task.objects.create(
+                user=self.user,
+                title=f'Task {i}',
+                due_date=today + timedelta(days=i % 5) if i % 6 else None,
+                status='completed' if i % 2 else 'pending',
+            )
+
+    def collect(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_cursor_pagination_walks_every_task_once(self):
+        ids = self.collect(f'{self.task_list_url}?pagination=cursor&page_size=4')
+        expected = list(
+            Task.objects.filter(user=self.user)
+            .order_by(F('due_date').asc(nulls_last=True), 'id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_cursor_pagination_descending_updated_at(self):
+        ids = self.collect(f'{self.task_list_url}?pagination=cursor&ordering=-updated_at&page_size=7')
+        expected = list(
+            Task.objects.filter(user=self.user).order_by('-updated_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_cursor_pagination_descending_due_date_keeps_nulls_last(self):
+        ids = self.collect(f'{self.task_list_url}?pagination=cursor&ordering=-due_date&page_size=4')
+        expected = list(
+            Task.objects.filter(user=self.user)
+            .order_by(F('due_date').desc(nulls_last=True), '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_cursor_pagination_created_at(self):
+        ids = self.collect(f'{self.task_list_url}?pagination=cursor&ordering=created_at&page_size=6')
+        expected = list(Task.objects.filter(user=self.user).order_by('created_at', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_cursor_page_uses_a_row_value_comparison(self):
+        first = self.client.get(f'{self.task_list_url}?pagination=cursor&page_size=4')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first.data['next'])
+        page = next(q['sql'] for q in queries if 'FROM "tasks_task"' in q['sql'])
+        where = page.split('WHERE')[1]
+        self.assertIn('("tasks_task"."due_date", "tasks_task"."id") >', where)
+        self.assertIn('"tasks_task"."due_date" IS NOT NULL', where)
+        self.assertNotIn(' OR ', where)
+
+    def test_cursor_pagination_with_filters(self):
+        ids = self.collect(f'{self.task_list_url}?pagination=cursor&status=pending&page_size=3')
+        expected = set(Task.objects.filter(user=self.user, status='pending').values_list('id', flat=True))
+        self.assertEqual(len(ids), len(expected))
+        self.assertEqual(set(ids), expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f'{self.task_list_url}?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class TaskQueryBudgetTests(TestCase):
+    # Número máximo de consultas por endpoint, independiente del número de tareas.
+    # Si un cambio en TaskSerializer reintroduce un N+1 estos tests fallan.
+    QUERY_BUDGETS = {
+        'list': 4,          # versión de la colección + COUNT + tareas con categoría + nombres de tags
+        'list_cursor': 3,   # versión de la colección + tareas con categoría + nombres de tags
+        'detail': 3,        # versión de la colección + tarea con categoría + prefetch de tags
+        'not_modified': 1,  # solo la versión de la colección
+        'cached_list': 1,   # versión de la colección; los datos salen de TaskListCache
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+        self.task_list_url = reverse('task-list')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.categories = [Category.objects.create(name=f'Category {i}') for i in range(3)]
+        self.tags = [Tag.objects.create(name=f'Tag {i}') for i in range(3)]
+
+    def create_tasks(self, count):
+        # Con fecha: el cursor por due_date no llega al bloque de nulos, que cuesta una consulta más
+        for i in range(count):
+            task = Task.objects.create(user=self.user, title=f'Task {i}', category=self.categories[i % 3],
+                                       due_date=date.today())
+            task.tags.set(self.tags[:i % 3 + 1])
+
+    def assertWithinBudget(self, endpoint, url, **headers):
+        self.client.get(url)  # crea la versión de la colección si aún no existe
+        if endpoint != 'cached_list':
+            cache.clear()
+        with self.assertNumQueries(self.QUERY_BUDGETS[endpoint]):
+            response = self.client.get(url, headers=headers)
+        expected_status = status.HTTP_304_NOT_MODIFIED if endpoint == 'not_modified' else status.HTTP_200_OK
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def test_list_query_budget(self):
+        self.create_tasks(1)
+        self.assertWithinBudget('list', self.task_list_url)
+        self.create_tasks(9)
+        response = self.assertWithinBudget('list', self.task_list_url)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertTrue(all(task['category_name'] for task in response.data['results']))
+        self.assertTrue(all(task['tags_names'] for task in response.data['results']))
+
+    def test_cursor_list_query_budget(self):
+        self.create_tasks(10)
+        self.assertWithinBudget('list_cursor', f'{self.task_list_url}?pagination=cursor')
+
+    def test_detail_query_budget(self):
+        self.create_tasks(1)
+        task = Task.objects.get(user=self.user)
+        response = self.assertWithinBudget('detail', reverse('task-detail', args=[task.id]))
+        self.assertEqual(response.data['tags_names'], ['Tag 0'])
+
+    def test_cached_list_query_budget(self):
+        self.create_tasks(10)
+        response = self.assertWithinBudget('cached_list', self.task_list_url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_not_modified_query_budget(self):
+        self.create_tasks(10)
+        etag = self.client.get(self.task_list_url)['ETag']
+        self.assertWithinBudget('not_modified', self.task_list_url, if_none_match=etag)
+
+class TaskBulkCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.bulk_url = reverse('task-bulk')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name='Trabajo')
+        self.tags = [Tag.objects.create(name=f'Tag {i}') for i in range(3)]
+
+    def test_non_scalar_related_values_are_rejected(self):
+        for item in ({'title': 'x', 'category': [1]}, {'title': 'x', 'tags': [{'id': 1}]}):
+            response = self.client.post(self.bulk_url, [item], format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Task.objects.count(), 0)
+
+    def payload(self, count):
+        return [
+            {'title': f'Importada {i}', 'category': self.category.id, 'tags': [tag.id for tag in self.tags[:i % 3 + 1]]}
+            for i in range(count)
+        ]
+
+    def test_bulk_create(self):
+        response = self.client.post(self.bulk_url, self.payload(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([task['title'] for task in response.data], ['Importada 0', 'Importada 1', 'Importada 2'])
+        self.assertEqual(response.data[2]['tags_names'], ['Tag 0', 'Tag 1', 'Tag 2'])
+        self.assertEqual(response.data[0]['category_name'], 'Trabajo')
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(Task.tags.through.objects.filter(task__user=self.user).count(), 6)
+
+    def test_query_count_does_not_depend_on_batch_size(self):
+        counts = []
+        for size in (2, 40):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.bulk_url, self.payload(size), format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_invalid_item_rejects_whole_batch(self):
+        payload = self.payload(2) + [{'title': 'Sin etiqueta', 'tags': [999999]}, {'category': 'x'}]
+        response = self.client.post(self.bulk_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('tags', response.data[2])
+        self.assertIn('title', response.data[3])
+        self.assertIn('category', response.data[3])
+        self.assertFalse(Task.objects.exists())
+
+    def test_empty_and_oversized_batches_are_rejected(self):
+        response = self.client.post(self.bulk_url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with mock.patch.object(TaskViewSet, 'bulk_max_items', 2):
+            response = self.client.post(self.bulk_url, self.payload(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_invalidates_list_etag(self):
+        response = self.client.get(reverse('task-list'))
+        etag = response['ETag']
+        self.client.post(self.bulk_url, self.payload(1), format='json')
+        response = self.client.get(reverse('task-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+class TaskBulkUpdateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.bulk_url = reverse('task-bulk')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name='Trabajo')
+        self.tag = Tag.objects.create(name='Urgente')
+        self.tasks = [Task.objects.create(user=self.user, title=f'Task {i}') for i in range(4)]
+        self.ids = [task.id for task in self.tasks]
+        Task.objects.update(updated_at=F('updated_at') - timedelta(days=1))
+
+    def test_shared_changes(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.bulk_url, {'ids': self.ids, 'changes': {'status': 'completed'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({task['status'] for task in response.data}, {'completed'})
+        self.assertEqual(Task.objects.filter(status='completed').count(), 4)
+        updates = [q for q in queries if q['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_per_task_changes_are_grouped_by_value(self):
+        payload = [
+            {'id': self.ids[0], 'status': 'in_progress'},
+            {'id': self.ids[1], 'status': 'in_progress'},
+            {'id': self.ids[2], 'status': 'completed', 'category': self.category.id, 'tags': [self.tag.id]},
+            {'id': self.ids[3], 'tags': [self.tag.id]},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.bulk_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q for q in queries if q['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(updates), 3)
+        by_id = {task['id']: task for task in response.data}
+        self.assertEqual(by_id[self.ids[1]]['status'], 'in_progress')
+        self.assertEqual(by_id[self.ids[2]]['category_name'], 'Trabajo')
+        self.assertEqual(by_id[self.ids[3]]['tags_names'], ['Urgente'])
+        self.assertEqual(by_id[self.ids[3]]['status'], 'pending')
+
+    def test_updated_at_is_refreshed(self):
+        before = Task.objects.get(pk=self.ids[0]).updated_at
+        self.client.patch(self.bulk_url, [{'id': self.ids[0], 'tags': [self.tag.id]}], format='json')
+        self.assertGreater(Task.objects.get(pk=self.ids[0]).updated_at, before)
+
+    def test_other_users_tasks_are_not_found(self):
+        other = User.objects.create_user(username='other', password='password')
+        foreign = Task.objects.create(user=other, title='Ajena')
+        missing = foreign.id + 1000
+        response = self.client.patch(self.bulk_url, {'ids': [self.ids[0], foreign.id, missing], 'changes': {'status': 'completed'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        # Ajenas e inexistentes se informan igual
+        self.assertEqual(response.data['detail'], f'No existen las tareas: {foreign.id}, {missing}.')
+        self.assertFalse(Task.objects.filter(status='completed').exists())
+
+    def test_invalid_payloads(self):
+        response = self.client.patch(self.bulk_url, {'changes': {'status': 'completed'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(self.bulk_url, [{'id': self.ids[0]}, {'id': self.ids[1], 'status': 'nope'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', response.data[0])
+        self.assertIn('status', response.data[1])
+        response = self.client.patch(self.bulk_url, [{'id': self.ids[0], 'status': 'completed'}] * 2, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(self.bulk_url, [{'id': 999999, 'status': 'completed'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class TaskBulkDeleteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.bulk_url = reverse('task-bulk')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        tag = Tag.objects.create(name='Urgente')
+        for i in range(7):
+            task = Task.objects.create(user=self.user, title=f'Task {i}', status='completed' if i % 2 == 0 else 'pending')
+            task.tags.add(tag)
+        self.other = User.objects.create_user(username='other', password='password')
+        Task.objects.create(user=self.other, title='Ajena', status='completed')
+
+    def test_deletes_filtered_tasks_in_chunks(self):
+        with mock.patch.object(TaskViewSet, 'bulk_delete_chunk_size', 2):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.delete(f'{self.bulk_url}?status=completed')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'deleted': 4})
+        self.assertEqual(Task.objects.filter(user=self.user, status='completed').count(), 0)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(Task.objects.filter(user=self.other).count(), 1)
+        self.assertEqual(Task.tags.through.objects.count(), 3)
+        task_deletes = [q for q in queries if q['sql'].startswith('DELETE FROM "tasks_task" ')]
+        self.assertEqual(len(task_deletes), 2)
+
+    def test_filter_is_required(self):
+        response = self.client.delete(self.bulk_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Task.objects.count(), 8)
+
+    def test_empty_filter_values_do_not_count(self):
+        response = self.client.delete(f'{self.bulk_url}?status=&title=')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Task.objects.count(), 8)
+
+    def test_bulk_delete_invalidates_list_etag(self):
+        etag = self.client.get(reverse('task-list'))['ETag']
+        self.client.delete(f'{self.bulk_url}?status=pending')
+        response = self.client.get(reverse('task-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 4)
+
+class TaskTagNamesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.task_list_url = reverse('task-list')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.urgent = Tag.objects.create(name='Urgente')
+
+    def test_create_with_tag_names(self):
+        data = {'title': 'Compra', 'tag_names_input': ['Urgente', 'Casa'], 'tags': [self.urgent.id]}
+        response = self.client.post(self.task_list_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(sorted(response.data['tags_names']), ['Casa', 'Urgente'])
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_update_replaces_tags_with_names(self):
+        task = Task.objects.create(user=self.user, title='Compra')
+        task.tags.add(self.urgent)
+        response = self.client.patch(reverse('task-detail', args=[task.id]), {'tag_names_input': ['Casa']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(task.tags.values_list('name', flat=True)), ['Casa'])
+
+    def test_bulk_create_upserts_names_once(self):
+        payload = [{'title': f'Task {i}', 'tag_names_input': ['Casa', f'Nueva {i % 2}']} for i in range(10)]
+        response = self.client.post(reverse('task-bulk'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(Tag.objects.values_list('name', flat=True)), {'Urgente', 'Casa', 'Nueva 0', 'Nueva 1'})
+        self.assertEqual(Task.tags.through.objects.count(), 20)
+
+class TaskIfMatchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        self.tag = Tag.objects.create(name='Urgente')
+        self.task = Task.objects.create(user=self.user, title='Task 1')
+        self.url = reverse('task-detail', args=[self.task.id])
+
+    def test_writes_bump_version(self):
+        self.assertEqual(self.client.get(self.url).data['version'], 1)
+        response = self.client.patch(self.url, {'title': 'Sin If-Match'}, format='json')
+        self.assertEqual(response.data['version'], 2)
+
+    def test_patch_with_matching_version(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'title': 'Editada', 'tags': [self.tag.id]}, format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Task-Version'], '"2"')
+        self.assertEqual(response.data['title'], 'Editada')
+        self.assertEqual(response.data['tags_names'], ['Urgente'])
+        # Sin lectura previa: la primera consulta sobre tasks_task es el UPDATE condicional
+        first = next(q['sql'] for q in queries if 'FROM "tasks_task"' in q['sql'] or 'UPDATE "tasks_task"' in q['sql'])
+        self.assertTrue(first.startswith('UPDATE "tasks_task"'))
+        self.assertIn('"version"', first.split('WHERE')[1])
+
+    def test_detail_task_version_round_trips_to_if_match(self):
+        response = self.client.get(self.url)
+        version = response['Task-Version']
+        self.assertEqual(version, '"1"')
+        self.assertNotEqual(response['ETag'], version)
+        response = self.client.patch(self.url, {'title': 'Editada'}, format='json', HTTP_IF_MATCH=version)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        version = self.client.get(f'{self.url}?fields=title')['Task-Version']
+        self.assertEqual(version, response['Task-Version'])
+        self.assertEqual(self.client.delete(self.url, HTTP_IF_MATCH=version).status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_stale_version_returns_412(self):
+        self.client.patch(self.url, {'title': 'Otro dispositivo'}, format='json')
+        response = self.client.patch(self.url, {'title': 'Editada'}, format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, 'Otro dispositivo')
+        response = self.client.patch(self.url, {'title': 'Editada'}, format='json', HTTP_IF_MATCH='W/"2"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_other_users_task_is_not_found(self):
+        other = User.objects.create_user(username='other', password='password')
+        foreign = Task.objects.create(user=other, title='Ajena')
+        url = reverse('task-detail', args=[foreign.id])
+        response = self.client.put(url, {'title': 'Mía'}, format='json', HTTP_IF_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.delete(url, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Task.objects.filter(pk=foreign.id).exists())
+
+    def test_delete_with_if_match(self):
+        self.task.tags.add(self.tag)
+        response = self.client.delete(self.url, HTTP_IF_MATCH='"7"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(list(self.task.tags.all()), [self.tag])
+        response = self.client.delete(self.url, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Task.objects.filter(pk=self.task.id).exists())
+        self.assertFalse(Task.tags.through.objects.exists())
+
+class TaskImportViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.import_url = reverse('task-import')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+
+    def test_import_jsonl_upload(self):
+        content = b'{"title": "Importada", "tags": ["Casa"]}\n{"priority": "x"}\n'
+        upload = SimpleUploadedFile('tareas.jsonl', content, content_type='application/x-ndjson')
+        response = self.client.post(self.import_url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rows_imported'], 1)
+        self.assertEqual(response.data['rows_failed'], 1)
+        self.assertEqual(response.data['errors'][0]['line'], 2)
+        self.assertEqual(Task.objects.get(user=self.user).tags.get().name, 'Casa')
+
+    def test_import_requires_known_format(self):
+        response = self.client.post(self.import_url, {}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        upload = SimpleUploadedFile('tareas.xlsx', b'x')
+        response = self.client.post(self.import_url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_rejects_non_utf8_file(self):
+        content = 'title,description\nCafé,Año nuevo\n'.encode('latin-1')
+        upload = SimpleUploadedFile('tareas.csv', content, content_type='text/csv')
+        response = self.client.post(self.import_url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['file_error']['line'], 2)
+        self.assertIn('UTF-8', response.data['file_error']['error'])
+        self.assertFalse(Task.objects.exists())
+
+class IdempotencyKeyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.task_list_url = reverse('task-list')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+
+    def test_retry_returns_original_response(self):
+        data = {'title': 'Una sola vez'}
+        first = self.client.post(self.task_list_url, data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.client.post(self.task_list_url, data, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_same_key_with_other_body_is_rejected(self):
+        self.client.post(self.task_list_url, {'title': 'A'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        response = self.client.post(self.task_list_url, {'title': 'B'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user_and_failures_are_not_stored(self):
+        response = self.client.post(self.task_list_url, {}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.task_list_url, {'title': 'A'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        other = User.objects.create_user(username='other', password='password')
+        self.client.force_authenticate(user=other)
+        response = self.client.post(self.task_list_url, {'title': 'A'}, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_bulk_create_and_registration(self):
+        payload = [{'title': 'A'}, {'title': 'B'}]
+        for _ in range(2):
+            response = self.client.post(reverse('task-bulk'), payload, format='json', HTTP_IDEMPOTENCY_KEY='bulk-1')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.count(), 2)
+        client = APIClient()
+        data = {'username': 'newuser', 'email': 'new@example.com', 'password': 'securepassword'}
+        first = client.post(reverse('register'), data, format='json', HTTP_IDEMPOTENCY_KEY='reg-1')
+        retry = client.post(reverse('register'), data, format='json', HTTP_IDEMPOTENCY_KEY='reg-1')
+        self.assertEqual(retry.status_code, first.status_code)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(User.objects.filter(username='newuser').count(), 1)
+
+    def test_anonymous_keys_are_scoped_per_client(self):
+        client = APIClient()
+        data = {'username': 'newuser', 'email': 'new@example.com', 'password': 'securepassword'}
+        first = client.post(reverse('register'), data, format='json', HTTP_IDEMPOTENCY_KEY='reg-1',
+                            REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        # Otro cliente con la misma clave y datos no recibe la respuesta (ni los tokens) del primero
+        other = client.post(reverse('register'), data, format='json', HTTP_IDEMPOTENCY_KEY='reg-1',
+                            REMOTE_ADDR='10.0.0.2')
+        self.assertNotIn('Idempotent-Replayed', other)
+        self.assertEqual(other.status_code, status.HTTP_400_BAD_REQUEST)
+
+class BatchViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.batch_url = reverse('batch')
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.client.force_authenticate(user=self.user)
+        Category.objects.create(name='Trabajo')
+        Task.objects.create(user=self.user, title='Task 1')
+
+    def test_startup_requests_in_one_call(self):
+        requests = [
+            {'id': 'tasks', 'path': '/api/tasks/'},
+            {'id': 'categories', 'path': '/api/categories/'},
+            {'id': 'tags', 'path': '/api/tags/'},
+            {'id': 'missing', 'path': '/api/nada/'},
+        ]
+        response = self.client.post(self.batch_url, {'requests': requests}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {item['id']: item for item in response.data['responses']}
+        self.assertEqual([item['id'] for item in response.data['responses']], ['tasks', 'categories', 'tags', 'missing'])
+        self.assertEqual(results['tasks']['status'], 200)
+        self.assertEqual(results['tasks']['body']['results'][0]['title'], 'Task 1')
+        self.assertIn('ETag', results['tasks']['headers'])
+        self.assertEqual(results['categories']['body']['results'][0]['name'], 'Trabajo')
+        self.assertEqual(results['missing']['status'], 404)
+        self.assertIn('duration_ms', results['tags'])
+
+    def test_writes_and_conditional_reads(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+        requests = [
+            {'path': '/api/tasks/', 'headers': {'If-None-Match': etag}},
+            {'method': 'POST', 'path': '/api/tasks/', 'body': {'title': 'Desde el batch'}},
+            {'path': '/api/tasks/', 'headers': {'If-None-Match': etag}},
+            {'method': 'POST', 'path': '/api/tasks/', 'body': {}},
+        ]
+        response = self.client.post(self.batch_url, {'requests': requests}, format='json')
+        statuses = [item['status'] for item in response.data['responses']]
+        self.assertEqual(statuses, [304, 201, 200, 400])
+        self.assertEqual(Task.objects.get(title='Desde el batch').user, self.user)
+
+    def test_requires_authentication_and_valid_payload(self):
+        response = APIClient().post(self.batch_url, {'requests': [{'path': '/api/tasks/'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(self.batch_url, {'requests': [{'path': 'api/tasks/'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.batch_url, {'requests': [{'path': '/api/batch/'}]}, format='json')
+        self.assertEqual(response.data['responses'][0]['status'], 404)
+
+    def test_non_api_views_are_not_dispatched(self):
+        requests = [{'path': '/admin/login/'}, {'path': '/'}]
+        response = self.client.post(self.batch_url, {'requests': requests}, format='json')
+        self.assertEqual([item['status'] for item in response.data['responses']], [404, 404])
+
+    def test_async_views_are_not_dispatched(self):
+        match = ResolverMatch(views.AsyncLoginView.as_view(), (), {})
+        with mock.patch('tasks.batch.resolve', return_value=match):
+            self.assertIsNone(batch.resolve_api_view('/api/login/', views.BatchView))
+
+    def test_failing_subrequest_returns_500_item(self):
+        requests = [
+            {'method': 'POST', 'path': '/api/tasks/', 'body': {'title': 'Antes'}},
+            {'path': '/api/tasks/'},
+        ]
+        with mock.patch.object(TaskViewSet, 'list', side_effect=TypeError('boom')):
+            response = self.client.post(self.batch_url, {'requests': requests}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['status'] for item in response.data['responses']], [201, 500])
+
+class BatchViewParallelReadsTests(TransactionTestCase):
+    def test_reads_run_in_worker_threads(self):
+        user = User.objects.create_user(username='testuser', password='testpassword')
+        Task.objects.create(user=user, title='Task 1')
+        client = APIClient()
+        client.force_authenticate(user=user)
+        requests = [{'path': '/api/tasks/'}, {'path': '/api/tags/'}, {'path': '/api/categories/'}]
+        with mock.patch('tasks.batch.run_in_thread', wraps=batch.run_in_thread) as run_in_thread:
+            response = client.post(reverse('batch'), {'requests': requests}, format='json')
+        self.assertEqual(run_in_thread.call_count, 3)
+        self.assertEqual([item['status'] for item in response.data['responses']], [200, 200, 200])
+        self.assertEqual(response.data['responses'][0]['body']['count'], 1)
+
 class CategoryViewSetTests(TestCase):
     def setUp(self):
         self.client = APIClient()
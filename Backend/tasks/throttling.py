@@ -0,0 +1,136 @@
+"""
+Límites de peticiones para login, forgot_password y reset_password.
+
+Cada petición cuenta a la vez para su IP (tasa '<scope>_ip') y para la cuenta a
+la que apunta (tasa '<scope>', clave por el campo ``account_field`` del
+cuerpo), así que ni una IP puede probar muchas cuentas ni muchas IPs pueden
+atacar la misma cuenta.
+
+El contador es una ventana deslizante aproximada: dos contadores de ventana
+fija en la caché (la actual y la anterior) y una estimación
+``anterior * (parte de la ventana anterior que aún cuenta) + actual``. Decidir
+cuesta un solo get_many(); las peticiones admitidas suman con incr(), que es
+atómico entre procesos. Las rechazadas no cuentan, como en los throttles de DRF.
+
+Las vistas que los usan no tienen clases de autenticación: DRF comprueba los
+throttles en initial(), así que una petición rechazada se responde sin
+autenticate(), sin hashing de contraseñas y sin ninguna consulta.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (10, 60); None -> (None, None)."""
+    if rate is None:
+        return None, None
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    scope = None
+    account_field = None
+    key_prefix = 'throttle'
+    timer = time.time
+
+    def __init__(self):
+        self.limits = {
+            'ip': parse_rate(self.get_rate(f'{self.scope}_ip')),
+            'account': parse_rate(self.get_rate(self.scope)),
+        }
+        self.wait_seconds = None
+
+    def get_rate(self, scope):
+        # Se lee en cada instancia (no al importar) para que override_settings funcione
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[scope]
+        except KeyError:
+            raise ImproperlyConfigured(f"No hay tasa de throttling para el scope '{scope}'")
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def get_account(self, request):
+        # Un cuerpo mal formado lanza ParseError aquí: DRF responde 400 antes de la vista
+        value = request.data.get(self.account_field) if hasattr(request.data, 'get') else None
+        if not value:
+            return None
+        return str(value).strip().lower()
+
+    def get_idents(self, request):
+        idents = {'ip': self.get_ident(request)}
+        account = self.get_account(request)
+        if account:
+            idents['account'] = account
+        return {kind: ident for kind, ident in idents.items() if self.limits[kind][0] is not None}
+
+    def make_key(self, kind, ident, window):
+        digest = hashlib.blake2b(ident.encode(), digest_size=16).hexdigest()
+        return f'{self.key_prefix}:{self.scope}:{kind}:{digest}:{window}'
+
+    def allow_request(self, request, view):
+        idents = self.get_idents(request)
+        if not idents:
+            return True
+        now = self.timer()
+        keys = {}
+        for kind, ident in idents.items():
+            duration = self.limits[kind][1]
+            window = int(now // duration)
+            keys[kind] = (self.make_key(kind, ident, window), self.make_key(kind, ident, window - 1))
+        counts = self.cache.get_many([key for pair in keys.values() for key in pair])
+
+        for kind, (current_key, previous_key) in keys.items():
+            num_requests, duration = self.limits[kind]
+            current = counts.get(current_key, 0)
+            previous = counts.get(previous_key, 0)
+            elapsed = now % duration
+            if previous * (1 - elapsed / duration) + current >= num_requests:
+                self.wait_seconds = self.estimate_wait(num_requests, duration, current, previous, elapsed)
+                return False
+
+        for kind, (current_key, _previous_key) in keys.items():
+            self.incr(current_key, self.limits[kind][1] * 2)
+        return True
+
+    def estimate_wait(self, num_requests, duration, current, previous, elapsed):
+        if current >= num_requests or not previous:
+            return duration - elapsed
+        # Momento en que la parte de la ventana anterior que aún cuenta deja sitio
+        return max(duration * (1 - (num_requests - current) / previous) - elapsed, 0)
+
+    def incr(self, key, timeout):
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Contador todavía inexistente; add() no pisa uno creado por otro proceso
+            if not self.cache.add(key, 1, timeout):
+                self.cache.incr(key)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class LoginRateThrottle(SlidingWindowThrottle):
+    scope = 'login'
+    account_field = 'username'
+
+
+class ForgotPasswordRateThrottle(SlidingWindowThrottle):
+    scope = 'forgot_password'
+    account_field = 'email'
+
+
+class ResetPasswordRateThrottle(SlidingWindowThrottle):
+    scope = 'reset_password'
+    account_field = 'uidb64'
@@ -1,6 +1,6 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import token_verify
 from . import views
 
 router = DefaultRouter()
@@ -8,15 +8,27 @@ router.register(r'tasks', views.TaskViewSet, basename='task')
 router.register(r'categories', views.CategoryViewSet, basename='category')
 router.register(r'tags', views.TagViewSet, basename='tag')
 
+# Bajo ASGI, las vistas con hashing de contraseñas envían ese trabajo a un pool propio
+if settings.ASYNC_AUTH_VIEWS:
+    login_view = views.AsyncLoginView.as_view()
+    change_password_view = views.AsyncChangePasswordView.as_view()
+    reset_password_view = views.AsyncResetPasswordView.as_view()
+else:
+    login_view = views.LoginView.as_view()
+    change_password_view = views.ChangePasswordView.as_view()
+    reset_password_view = views.reset_password
+
 urlpatterns = [
     path('', include(router.urls)),
     path('api/', include(router.urls)),
     path('register/', views.UserRegistrationView.as_view(), name='register'),
-    path('login/', views.LoginView.as_view(), name='login'),
+    path('login/', login_view, name='login'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
     path('profile/', views.UserProfileView.as_view(), name='profile'),
-    path('profile/change-password/', views.ChangePasswordView.as_view(), name='change_password'),
+    path('profile/change-password/', change_password_view, name='change_password'),
     path('forgot-password/', views.forgot_password, name='forgot_password'),
-    path('reset-password/', views.reset_password, name='reset_password'),
-    path('token/verify/', token_verify, name='token_verify'),
+    path('reset-password/', reset_password_view, name='reset_password'),
+    path('token/refresh/', views.BlacklistTokenRefreshView.as_view(), name='token_refresh'),
+    path('token/verify/', views.BlacklistTokenVerifyView.as_view(), name='token_verify'),
+    path('batch/', views.BatchView.as_view(), name='batch'),
 ]
\ No newline at end of file
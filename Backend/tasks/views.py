@@ -1,23 +1,44 @@
 from rest_framework import viewsets, permissions, generics, status, exceptions
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, authentication_classes, permission_classes, throttle_classes
 from django.contrib.auth import get_user_model, update_session_auth_hash
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer, TokenVerifySerializer
+from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
 from .models import Task, Category, Tag, UserProfile
 from .serializers import (
     UserSerializer, UserRegistrationSerializer, UserProfileSerializer,
-    ChangePasswordSerializer, TaskSerializer, CategorySerializer, TagSerializer
+    ChangePasswordSerializer, AccountDeletionSerializer, TaskSerializer, TaskBulkUpdateSerializer, TaskValuesSerializer, CategorySerializer, TagSerializer
 )
 from django.core.mail import send_mail
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import default_token_generator
 from django.conf import settings
-import json
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import FilterSet, CharFilter, DateFilter
+from .pagination import TaskKeysetPagination
+from .imports import IMPORT_FORMATS, TaskImporter, detect_format
+from .bulk import bulk_delete_tasks, bulk_update_tasks, delete_task_if_match, update_task_if_match
+from .search import search_tasks
+from .conditional import TASK_VERSION_HEADER, ConditionalGetMixin, if_match_versions, version_etag
+from .cache import task_list_cache
+from .idempotency import idempotent
+from .batch import BatchRequestSerializer, run_batch
+from .accounts import request_account_deletion
+from .blacklist import BlacklistableRefreshToken, token_blacklist
+from .throttling import ForgotPasswordRateThrottle, LoginRateThrottle, ResetPasswordRateThrottle
+from .asyncviews import AsyncAPIViewMixin
+from .hashing import password_hashing
+from .authentication import SafeMethodsStatelessJWTAuthentication
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +48,11 @@ class TagViewSet(viewsets.ModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    authentication_classes = (SafeMethodsStatelessJWTAuthentication,)
 
 class TaskFilter(FilterSet):
-    title = CharFilter(field_name='title', lookup_expr='icontains')
-    description = CharFilter(field_name='description', lookup_expr='icontains')
+    title = CharFilter(field_name='title', lookup_expr='trigram_icontains')
+    description = CharFilter(field_name='description', lookup_expr='trigram_icontains')
     status = CharFilter(field_name='status', lookup_expr='exact')
     priority = CharFilter(field_name='priority', lookup_expr='exact')
     category = CharFilter(field_name='category_id', lookup_expr='exact') # Filtrar por ID de categoría
@@ -47,22 +69,11 @@ class UserRegistrationView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     permission_classes = (permissions.AllowAny,)
 
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-
-        username = serializer.validated_data.get('username')
-        email = serializer.validated_data.get('email')
-
-        errors = {}
-        if User.objects.filter(username=username).exists():
-            errors['username'] = ['Este nombre de usuario ya existe']
-        if User.objects.filter(email=email).exists():
-            errors['email'] = ['Este correo electrónico ya está registrado']
-
-        if errors:
-            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
-
+        # Los duplicados de username/email llegan como ValidationError desde el INSERT
         self.perform_create(serializer)
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
@@ -73,6 +84,9 @@ class UserRegistrationView(generics.CreateAPIView):
 class LoginView(generics.GenericAPIView):
     serializer_class = UserSerializer
     permission_classes = (permissions.AllowAny,)
+    # Sin autenticación: un login rechazado por el throttle no toca la base de datos
+    authentication_classes = ()
+    throttle_classes = (LoginRateThrottle,)
 
     def post(self, request):
         username = request.data.get('username')
@@ -87,19 +101,44 @@ class LoginView(generics.GenericAPIView):
             })
         return Response({'error': 'Credenciales inválidas'}, status=status.HTTP_401_UNAUTHORIZED)
 
+class AsyncLoginView(AsyncAPIViewMixin, LoginView):
+    """LoginView para ASGI: authenticate() y el hashing se ejecutan en el pool de tasks.hashing."""
+
+    async def post(self, request):
+        return await password_hashing.run(super().post, request)
+
 class LogoutView(generics.GenericAPIView):
     permission_classes = (permissions.IsAuthenticated,)
 
     def post(self, request):
         try:
             refresh_token = request.data["refresh_token"]
-            token = RefreshToken(refresh_token)
+            token = BlacklistableRefreshToken(refresh_token)
             token.blacklist()
             return Response(status=status.HTTP_205_RESET_CONTENT)
         except Exception as e:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class BlacklistTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = BlacklistableRefreshToken
+
+class BlacklistTokenRefreshView(TokenRefreshView):
+    """Refresco de tokens que rechaza los refresh tokens revocados en el logout."""
+    serializer_class = BlacklistTokenRefreshSerializer
+
+class BlacklistTokenVerifySerializer(TokenVerifySerializer):
+    def validate(self, attrs):
+        token = UntypedToken(attrs['token'])
+        jti = token.get(api_settings.JTI_CLAIM)
+        if jti is not None and token_blacklist.contains(jti):
+            raise TokenError('Token is blacklisted')
+        return {}
+
+class BlacklistTokenVerifyView(TokenVerifyView):
+    """Verificación de tokens que, como el refresco, rechaza los revocados en el logout."""
+    serializer_class = BlacklistTokenVerifySerializer
+
+class UserProfileView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = UserSerializer # Usamos UserSerializer aquí
     permission_classes = (permissions.IsAuthenticated,)
 
@@ -118,6 +157,11 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 
         return Response(serializer.data)
 
+    def destroy(self, request, *args, **kwargs):
+        # El usuario queda desactivado ya; sus datos se borran en segundo plano (tasks.accounts)
+        deletion = request_account_deletion(request.user)
+        return Response(AccountDeletionSerializer(deletion).data, status=status.HTTP_202_ACCEPTED)
+
 class ChangePasswordView(generics.UpdateAPIView):
     serializer_class = ChangePasswordSerializer
     permission_classes = (permissions.IsAuthenticated,)
@@ -135,11 +179,38 @@ class ChangePasswordView(generics.UpdateAPIView):
         update_session_auth_hash(request, user)
         return Response({'message': 'Contraseña actualizada con éxito'}, status=status.HTTP_200_OK)
 
-class TaskViewSet(viewsets.ModelViewSet):
+class AsyncChangePasswordView(AsyncAPIViewMixin, ChangePasswordView):
+    """ChangePasswordView para ASGI: check_password/set_password en el pool de tasks.hashing."""
+
+    async def put(self, request, *args, **kwargs):
+        return await password_hashing.run(self.update, request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await password_hashing.run(self.partial_update, request, *args, **kwargs)
+
+class TaskViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
+    # Lecturas con los claims del token; escrituras con el usuario completo (tasks.authentication)
+    authentication_classes = (SafeMethodsStatelessJWTAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
     filter_backends = [DjangoFilterBackend]
     filterset_class = TaskFilter
+    keyset_pagination_class = TaskKeysetPagination
+    bulk_max_items = 1000
+    bulk_delete_chunk_size = 1000
+
+    @property
+    def paginator(self):
+        # Paginación por cursor opcional: ?pagination=cursor (o un ?cursor= de una página previa)
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            wants_cursor = params.get('pagination') == 'cursor' or 'cursor' in params
+            # La búsqueda ordena por relevancia, no por un campo sobre el que hacer keyset
+            if wants_cursor and self.action != 'search':
+                self._paginator = self.keyset_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
 
     def get_queryset(self):
         user = self.request.user
@@ -147,34 +218,246 @@ class TaskViewSet(viewsets.ModelViewSet):
         logger.error(f"Valor de self.request.user: {user}")
         logger.error(f"ID de self.request.user: {user.id if hasattr(user, 'id') else None}")
         logger.error(f"Username de self.request.user: {user.username if hasattr(user, 'username') else None}")
-        return Task.objects.filter(user=user)
+        queryset = Task.objects.filter(user_id=user.pk)
+        fields = self.get_serializer_class().requested_fields(self.request)
+        if fields is None:
+            return queryset.select_related('category').prefetch_related('tags').defer('search_vector')
+
+        # ?fields= / ?omit=: solo se leen las columnas y relaciones que se van a serializar
+        columns = {'id'}
+        for name in fields:
+            columns.update(TaskSerializer.field_columns.get(name, ()))
+        if isinstance(self.paginator, TaskKeysetPagination):
+            columns.add(self.paginator.get_ordering_field(self.request))
+        if self.action == 'retrieve':
+            # Para la cabecera Task-Version
+            columns.add('version')
+        if 'category_name' in fields:
+            queryset = queryset.select_related('category')
+        if 'tags_names' in fields:
+            queryset = queryset.prefetch_related('tags')
+        return queryset.only(*columns)
 
     def get_serializer_context(self):
         return {'request': self.request}
 
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.cached_list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        # El 304 se decide con la versión de la colección, antes de get_object()
+        return self.conditional_response(request, self.versioned_retrieve, *args, **kwargs)
+
+    def versioned_retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return Response(self.get_serializer(instance).data, headers={TASK_VERSION_HEADER: version_etag(instance.version)})
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        # Con If-Match la escritura es un UPDATE condicionado a la versión, sin get_object()
+        versions = if_match_versions(request)
+        if versions is None:
+            response = super().update(request, *args, **kwargs)
+            response[TASK_VERSION_HEADER] = version_etag(response.data['version'])
+            return response
+        serializer = self.get_serializer(data=request.data, partial=kwargs.get('partial', False))
+        serializer.is_valid(raise_exception=True)
+        pk = self.get_lookup_pk()
+        with transaction.atomic():
+            if not update_task_if_match(request.user, pk, versions, serializer.validated_data):
+                return self.precondition_failed(pk)
+        data = self.bulk_rows([pk])[0]
+        return Response(data, headers={TASK_VERSION_HEADER: version_etag(data['version'])})
+
+    def destroy(self, request, *args, **kwargs):
+        versions = if_match_versions(request)
+        if versions is None:
+            return super().destroy(request, *args, **kwargs)
+        pk = self.get_lookup_pk()
+        with transaction.atomic():
+            if not delete_task_if_match(request.user, pk, versions):
+                return self.precondition_failed(pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def get_lookup_pk(self):
+        try:
+            return int(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except ValueError:
+            raise exceptions.NotFound()
+
+    def precondition_failed(self, pk):
+        # La escritura condicional no ha tocado ninguna fila: 404 si la tarea no es
+        # del usuario, 412 si existe pero con otra versión.
+        if not Task.objects.filter(pk=pk, user_id=self.request.user.pk).exists():
+            raise exceptions.NotFound()
+        return Response({'error': 'La tarea ha cambiado desde que se leyó. Vuelve a cargarla.'},
+                        status=status.HTTP_412_PRECONDITION_FAILED)
+
+    def cached_list(self, request, *args, **kwargs):
+        # conditional_response ya ha cargado la versión de la colección del usuario
+        key = task_list_cache.make_key(self.collection_version, request)
+        data = task_list_cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        response = self.list_values(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            task_list_cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list_values(self, request, *args, **kwargs):
+        # Solo lectura: se paginan filas de values() y se serializan sin instanciar Task
+        fast_serializer = TaskValuesSerializer(TaskSerializer.requested_fields(request))
+        extra = []
+        if isinstance(self.paginator, TaskKeysetPagination):
+            extra.append(self.paginator.get_ordering_field(request))
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        queryset = queryset.values(*fast_serializer.get_columns(*extra))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast_serializer.serialize(page))
+        return Response(fast_serializer.serialize(queryset))
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response({'error': 'Se requiere el parámetro q.'}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = search_tasks(self.filter_queryset(self.get_queryset()), text)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='bulk', url_name='bulk')
+    @idempotent
+    def bulk_create(self, request):
+        # Valida el lote completo; si alguna tarea falla no se inserta ninguna
+        serializer = self.get_serializer(data=request.data, many=True, allow_empty=False,
+                                         max_length=self.bulk_max_items)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            tasks = serializer.save(user_id=request.user.pk)
+        return Response(self.bulk_rows([task.pk for task in tasks]), status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    @idempotent
+    def bulk_update(self, request):
+        # Cambios por tarea: [{"id": 1, "status": "completed"}, ...]
+        # Cambios comunes: {"ids": [1, 2, 3], "changes": {"status": "completed"}}
+        data = request.data
+        if isinstance(data, dict):
+            ids, changes = data.get('ids'), data.get('changes')
+            if not isinstance(ids, list) or not isinstance(changes, dict):
+                return Response({'error': 'Se requieren "ids" (lista) y "changes" (objeto).'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            data = [{**changes, 'id': pk} for pk in ids]
+        serializer = TaskBulkUpdateSerializer(data=data, many=True, allow_empty=False,
+                                              max_length=self.bulk_max_items, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        ids = [item['id'] for item in serializer.validated_data]
+        with transaction.atomic():
+            self.check_bulk_ownership(ids)
+            bulk_update_tasks(request.user, serializer.validated_data)
+        return Response(self.bulk_rows(ids))
+
+    @bulk_create.mapping.delete
+    @idempotent
+    def bulk_destroy(self, request):
+        # Acepta los mismos parámetros que TaskFilter, p. ej. DELETE /api/tasks/bulk/?status=completed
+        filterset = self.filterset_class(request.query_params, queryset=Task.objects.filter(user_id=request.user.pk),
+                                         request=request)
+        if not filterset.is_valid():
+            raise exceptions.ValidationError(filterset.errors)
+        # django-filter ignora los valores vacíos: ?status= no filtraría nada y lo borraría todo
+        if not any(value not in (None, '', []) for value in filterset.form.cleaned_data.values()):
+            return Response({'error': 'Se requiere al menos un filtro para el borrado masivo.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        deleted = bulk_delete_tasks(request.user, filterset.qs, self.bulk_delete_chunk_size)
+        return Response({'deleted': deleted})
+
+    @action(detail=False, methods=['post'], url_path='import', url_name='import',
+            parser_classes=[MultiPartParser])
+    def import_file(self, request):
+        # Multipart con el archivo en "file"; el formato sale de la extensión o del campo "import_format"
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Se requiere un archivo en el campo "file".'}, status=status.HTTP_400_BAD_REQUEST)
+        file_format = request.data.get('import_format') or detect_format(upload.name)
+        if file_format not in IMPORT_FORMATS:
+            return Response({'error': f'Formato no soportado; usa uno de: {", ".join(IMPORT_FORMATS)}.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        report = TaskImporter(request.user).run(upload.file, file_format)
+        # Archivo ilegible (codificación o CSV mal formado): file_error indica desde qué línea
+        response_status = status.HTTP_400_BAD_REQUEST if report.file_error else status.HTTP_200_OK
+        return Response(report.as_dict(), status=response_status)
+
+    def check_bulk_ownership(self, ids):
+        # Como el PATCH individual, cuyo queryset es el del usuario: las tareas ajenas son
+        # 404, igual que las inexistentes, para no revelar qué ids existen en otras cuentas
+        owned = set(Task.objects.select_for_update().filter(user_id=self.request.user.pk, pk__in=ids)
+                    .values_list('id', flat=True))
+        missing = [pk for pk in ids if pk not in owned]
+        if missing:
+            raise exceptions.NotFound(f"No existen las tareas: {', '.join(map(str, missing))}.")
+
+    def bulk_rows(self, ids):
+        fast_serializer = TaskValuesSerializer()
+        rows = Task.objects.filter(pk__in=ids).order_by('id').values(*fast_serializer.get_columns())
+        return fast_serializer.serialize(rows)
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
 
     def perform_update(self, serializer):
-        if serializer.instance.user != self.request.user:
+        if serializer.instance.user_id != self.request.user.pk:
             raise exceptions.PermissionDenied("No tienes permiso para editar esta tarea.")
         serializer.save()
 
     def perform_destroy(self, instance):
-        if instance.user != self.request.user:
+        if instance.user_id != self.request.user.pk:
             raise exceptions.PermissionDenied("No tienes permiso para eliminar esta tarea.")
         instance.delete()
 
+class BatchView(generics.GenericAPIView):
+    """
+    POST /api/batch/ con {"requests": [{"method": "GET", "path": "/api/tasks/"}, ...]}.
+    Autentica una vez y devuelve {"responses": [...]} con el estado, el cuerpo y
+    el tiempo de cada sub-petición, en el mismo orden (ver tasks.batch).
+    """
+    serializer_class = BatchRequestSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request):
+        started = time.perf_counter()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        responses = run_batch(request, serializer.validated_data['requests'], BatchView)
+        return Response({
+            'responses': responses,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        })
+
 class CategoryViewSet(viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    authentication_classes = (SafeMethodsStatelessJWTAuthentication,)
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@authentication_classes([])
+@throttle_classes([ForgotPasswordRateThrottle])
 def forgot_password(request):
     try:
-        data = json.loads(request.body)
+        data = request.data
         email = data.get('email')
         if not email:
             return Response({'error': 'Se requiere un correo electrónico.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -197,16 +480,18 @@ def forgot_password(request):
 
         return Response({'message': 'Se ha enviado un correo electrónico con instrucciones para restablecer tu contraseña.'}, status=status.HTTP_200_OK)
 
-    except json.JSONDecodeError:
+    except ParseError:
         return Response({'error': 'Formato JSON inválido.'}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({'error': f'Ocurrió un error inesperado: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@authentication_classes([])
+@throttle_classes([ResetPasswordRateThrottle])
 def reset_password(request):
     try:
-        data = json.loads(request.body)
+        data = request.data
         uidb64 = data.get('uidb64')
         token = data.get('token')
         new_password = data.get('new_password')
@@ -232,7 +517,13 @@ def reset_password(request):
             return Response({'message': 'Contraseña restablecida con éxito', 'access_token': access_token}, status=status.HTTP_200_OK)
         else:
             return Response({'error': 'Enlace de restablecimiento de contraseña inválido o expirado.'}, status=status.HTTP_400_BAD_REQUEST)
-    except json.JSONDecodeError:
+    except ParseError:
         return Response({'error': 'Formato JSON inválido.'}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        return Response({'error': f'Ocurrió un error inesperado: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({'error': f'Ocurrió un error inesperado: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class AsyncResetPasswordView(AsyncAPIViewMixin, reset_password.cls):
+    """reset_password para ASGI (misma configuración que la vista de @api_view): set_password en el pool."""
+
+    async def post(self, request, *args, **kwargs):
+        return await password_hashing.run(super().post, request, *args, **kwargs)